@@ -26,6 +26,12 @@ const WS_BASE_URL = 'ws://localhost:8000/stt/ws/audio';
 const INPUT_SAMPLE_RATE = 16000;
 const OUTPUT_SAMPLE_RATE = 44100;
 
+// Binary frame tags sent by the server (first byte of each binary frame)
+const FRAME_AUDIO_START = 0x01;
+const FRAME_AUDIO_CHUNK = 0x02;
+const FRAME_AUDIO_END = 0x03;
+const FRAME_INTERRUPTED = 0x04;
+
 export function useVoiceBot(options: UseVoiceBotOptions = {}): UseVoiceBotReturn {
   const { token, userId } = options;
   
@@ -341,12 +347,26 @@ export function useVoiceBot(options: UseVoiceBotOptions = {}): UseVoiceBotReturn
       };
 
       ws.onmessage = async (event) => {
-        // Handle binary audio data
+        // Handle binary frames: first byte is the tag, audio chunks carry PCM float32 after it
         if (event.data instanceof Blob) {
-          const arrayBuffer = await event.data.arrayBuffer();
-          const audioData = new Float32Array(arrayBuffer as ArrayBuffer);
-          audioQueueRef.current.push(audioData);
-          playAudioQueue();
+          const frame = await event.data.arrayBuffer();
+          const tag = new Uint8Array(frame, 0, 1)[0];
+          if (tag === FRAME_AUDIO_CHUNK) {
+            const audioData = new Float32Array(frame.slice(1));
+            audioQueueRef.current.push(audioData);
+            playAudioQueue();
+          } else if (tag === FRAME_AUDIO_START) {
+            console.log('🔊 Receiving TTS audio...');
+          } else if (tag === FRAME_AUDIO_END) {
+            console.log('✅ TTS audio complete');
+          } else if (tag === FRAME_INTERRUPTED) {
+            console.log('⚠️  TTS interrupted');
+            // Clear audio queue on interruption
+            audioQueueRef.current = [];
+            isPlayingRef.current = false;
+            setStreamingResponse('');  // Clear streaming response on interruption
+            setIsNewSpeech(true);  // Ready for next speech
+          }
         } 
         // Handle JSON messages
         else if (typeof event.data === 'string') {
@@ -382,17 +402,6 @@ export function useVoiceBot(options: UseVoiceBotOptions = {}): UseVoiceBotReturn
               if (data.conversation_history) {
                 setConversationHistory(data.conversation_history);
               }
-            } else if (data.type === 'audio_start') {
-              console.log('🔊 Receiving TTS audio...');
-            } else if (data.type === 'audio_end') {
-              console.log('✅ TTS audio complete');
-            } else if (data.type === 'interrupted') {
-              console.log('⚠️  TTS interrupted');
-              // Clear audio queue on interruption
-              audioQueueRef.current = [];
-              isPlayingRef.current = false;
-              setStreamingResponse('');  // Clear streaming response on interruption
-              setIsNewSpeech(true);  // Ready for next speech
             } else if (data.type === 'handoff_queued') {
               // User has been added to the queue for human agent
               console.log('📞 Handoff queued:', data.session_id);
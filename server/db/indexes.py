@@ -1,7 +1,7 @@
 """Create MongoDB indexes for query patterns and uniqueness."""
 
 import logging
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 
@@ -53,6 +53,8 @@ async def _ensure_index(
     keys: List[Tuple[str, Any]],
     *,
     unique: bool = False,
+    sparse: bool = False,
+    partial_filter: Optional[Dict[str, Any]] = None,
     name: str,
 ) -> bool:
     """
@@ -61,7 +63,66 @@ async def _ensure_index(
     """
     if await _index_with_spec_exists(coll, keys, unique=unique):
         return False
-    await coll.create_index(keys, unique=unique, name=name)
+    options: Dict[str, Any] = {"unique": unique, "sparse": sparse, "name": name}
+    if partial_filter is not None:
+        options["partialFilterExpression"] = partial_filter
+    await coll.create_index(keys, **options)
+    return True
+
+
+async def _ensure_unique_string_index(
+    coll: AsyncIOMotorCollection,
+    field: str,
+    *,
+    name: str,
+    fallback_name: str,
+) -> bool:
+    """
+    Unique index on field over documents where it is a string.
+
+    A partial filter rather than sparse: sparse still indexes explicit nulls, so a
+    second user with email=None would violate uniqueness. Existing data is checked
+    first; while duplicates remain we keep (or create) a plain index so lookups stay
+    indexed, and log the offending values instead of failing startup. A non-unique
+    index on the same key is replaced once the data is clean.
+    Return True if an index was created.
+    """
+    keys = [(field, 1)]
+    partial = {field: {"$type": "string"}}
+    info = await coll.index_information()
+    stale: List[str] = []
+    for idx_name, spec in info.items():
+        existing_key = spec.get("key") or []
+        key_list = list(existing_key.items()) if hasattr(existing_key, "items") else existing_key
+        if not _key_spec_matches(key_list, keys):
+            continue
+        if spec.get("unique", False) and spec.get("partialFilterExpression") == partial:
+            return False
+        stale.append(idx_name)
+
+    duplicates = await coll.aggregate(
+        [
+            {"$match": partial},
+            {"$group": {"_id": f"${field}", "n": {"$sum": 1}}},
+            {"$match": {"n": {"$gt": 1}}},
+            {"$limit": 5},
+        ]
+    ).to_list(length=5)
+    if duplicates:
+        logger.warning(
+            "Not making %s.%s unique: duplicate values exist (e.g. %s)",
+            coll.name,
+            field,
+            [d["_id"] for d in duplicates],
+        )
+        if stale:
+            return False
+        await coll.create_index(keys, name=fallback_name)
+        return True
+
+    for idx_name in stale:
+        await coll.drop_index(idx_name)
+    await coll.create_index(keys, unique=True, partialFilterExpression=partial, name=name)
     return True
 
 
@@ -72,12 +133,18 @@ async def create_indexes(db: AsyncIOMotorDatabase) -> None:
     """
     total_created = 0
 
-    # users: unique on user_id; phone_number for Twilio user lookup
+    # users: unique on user_id, phone_number and email so every branch of the login
+    # $or is an index scan (phone_number also serves the Twilio user lookup)
     c = 0
     if await _ensure_index(db.users, [("user_id", 1)], unique=True, name="user_id_unique"):
         c += 1
         total_created += 1
-    if await _ensure_index(db.users, [("phone_number", 1)], name="phone_number_1"):
+    if await _ensure_unique_string_index(
+        db.users, "phone_number", name="phone_number_unique", fallback_name="phone_number_1"
+    ):
+        c += 1
+        total_created += 1
+    if await _ensure_unique_string_index(db.users, "email", name="email_unique", fallback_name="email_1"):
         c += 1
         total_created += 1
     if c:
@@ -194,6 +261,27 @@ async def create_indexes(db: AsyncIOMotorDatabase) -> None:
     if await _ensure_index(db.call_transcripts, [("twilio_call_sid", 1)], name="twilio_call_sid_1"):
         c += 1
         total_created += 1
+    # Compound indexes follow equality-then-range order: start_time (the range/sort key)
+    # comes after the equality keys so $match on user_id/call_source + a start_time window
+    # is a bounded IXSCAN; only the _id tiebreaker may follow it.
+    # Keyset pagination for GET /api/calls/transcripts: filters then (start_time, _id) order.
+    # Its {user_id, call_source, start_time} prefix also serves source-filtered analytics.
+    if await _ensure_index(
+        db.call_transcripts,
+        [("user_id", 1), ("call_source", 1), ("start_time", -1), ("_id", -1)],
+        name="user_id_1_call_source_1_start_time_-1__id_-1",
+    ):
+        c += 1
+        total_created += 1
+    # Per-user analytics window: $match {user_id, start_time: {$gte: ...}}
+    if await _ensure_index(
+        db.call_transcripts,
+        [("user_id", 1), ("start_time", -1)],
+        partial_filter={"start_time": {"$exists": True}},
+        name="user_id_1_start_time_-1",
+    ):
+        c += 1
+        total_created += 1
     if c:
         logger.info("Indexes call_transcripts.* created")
 
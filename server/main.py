@@ -15,10 +15,11 @@ from routers.twilio import router as twilio_router
 from routers.batteries import router as batteries_router
 from routers.auth import router as auth_router
 from routers.user import router as user_router
-from routers.call_transcripts import router as call_transcripts_router
-from routers.location import router as location_router
+from routers.call_transcripts import NEXT_CURSOR_HEADER, router as call_transcripts_router
+from routers.location import router as location_router, get_geo_client, close_geo_client
 from routers.agent import router as agent_router
 from db.connection import get_db, close_client
+from services.stt.vad_service import get_base_model as get_vad_model
 from db.indexes import create_indexes
 
 # Configure logging
@@ -53,11 +54,19 @@ async def lifespan(app: FastAPI):
     await create_indexes(db)
     logger.info("✓ MongoDB connected")
 
+    # Shared HTTP client so geocoding reuses pooled connections
+    get_geo_client()
+
+    # Load and warm Silero once so the first call doesn't pay for it
+    get_vad_model()
+    logger.info("✓ VAD model warmed up")
+
     logger.info("✓ Startup complete")
 
     yield  # Application runs here
 
     logger.info("Shutting down BatterySmart API...")
+    await close_geo_client()
     close_client()
     logger.info("✓ Shutdown complete")
 
@@ -77,6 +86,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let scripts read listed response headers
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -115,6 +126,7 @@ async def root():
             "call_transcripts_list": "GET /api/calls/transcripts",
             "call_transcript_get": "GET /api/calls/transcripts/{call_id}",
             "call_analytics": "GET /api/calls/analytics/summary",
+            "call_dashboard": "GET /api/calls/dashboard",
             "agent_websocket": "ws://localhost:8000/agent/ws/connect",
             "agent_queue_status": "/agent/queue/status",
             "agent_health": "/agent/health",
@@ -125,4 +137,7 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
+    # uvicorn's default loop setting already runs on uvloop when it is installed
+    # (a dependency everywhere but Windows), which cuts event-loop overhead on
+    # the audio websockets
     uvicorn.run(app, host="localhost", port=8000)
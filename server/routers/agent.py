@@ -2,22 +2,36 @@
 Agent Router - WebSocket endpoints for call center agents to handle warm handoffs
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Optional, List, Any
 import asyncio
-import json
 import logging
 import struct
+import time
 import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 import uuid
 
+import orjson
+
+from routers.ws_utils import AUDIO_CHUNK, PONG, WebSocketWriter, send_json_fast
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
+# Reuse the serialized queue_status snapshot for agents registering within this window
+QUEUE_SNAPSHOT_MAX_AGE_SECONDS = 1.0
+
 
 # Audio conversion utilities
+_FLOAT32_LE = struct.Struct('<f')
+
+# Bounded pool for relay audio conversion so it stays off the event loop
+_AUDIO_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent-audio")
+
+
 def pcm16_to_float32(pcm_bytes: bytes) -> bytes:
     """Convert PCM16 audio to Float32 format for WebSocket playback."""
     # Unpack PCM16 samples (little-endian signed 16-bit integers)
@@ -43,19 +57,34 @@ def upsample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
     ratio = to_rate / from_rate
     out_length = int(num_samples * ratio)
     
-    # Linear interpolation
-    result = []
+    # Linear interpolation, written straight into a preallocated output buffer
+    out = bytearray(out_length * 4)
+    pack_into = _FLOAT32_LE.pack_into
+    last = num_samples - 1
     for i in range(out_length):
         src_index = i / ratio
         idx0 = int(src_index)
-        idx1 = min(idx0 + 1, num_samples - 1)
+        idx1 = idx0 + 1 if idx0 < last else last
         frac = src_index - idx0
-        result.append(samples[idx0] * (1 - frac) + samples[idx1] * frac)
+        pack_into(out, i * 4, samples[idx0] * (1 - frac) + samples[idx1] * frac)
     
-    return struct.pack(f'<{len(result)}f', *result)
+    return bytes(out)
+
+
+def pcm16_upsample(pcm_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
+    """Convert PCM16 audio to Float32 and upsample it for playback."""
+    return upsample_audio(pcm16_to_float32(pcm_bytes), from_rate, to_rate)
+
 
+async def _send_json_to_user(user_ws: WebSocket, user_writer: Optional[WebSocketWriter], message: Dict[str, Any]) -> None:
+    """Send a JSON message to the user, through the call's writer when one is registered."""
+    if user_writer is not None:
+        user_writer.send_json(message)
+    else:
+        await send_json_fast(user_ws, message)
 
-@dataclass
+
+@dataclass(slots=True)
 class PendingHandoff:
     """Represents a user waiting for agent connection."""
     user_id: str
@@ -64,9 +93,15 @@ class PendingHandoff:
     requested_at: datetime
     conversation_history: List[Dict[str, str]]
     session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # The user call's writer task; user-bound frames are queued on it when set
+    user_writer: Optional[WebSocketWriter] = None
+    requested_at_iso: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.requested_at_iso = self.requested_at.isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class ActiveCall:
     """Represents an active call between user and agent."""
     session_id: str
@@ -76,6 +111,11 @@ class ActiveCall:
     agent_ws: WebSocket
     started_at: datetime
     conversation_history: List[Dict[str, str]]
+    user_writer: Optional[WebSocketWriter] = None
+    started_at_iso: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.started_at_iso = self.started_at.isoformat()
 
 
 class HandoffManager:
@@ -85,16 +125,39 @@ class HandoffManager:
         self.pending_handoffs: Dict[str, PendingHandoff] = {}  # session_id -> PendingHandoff
         self.active_calls: Dict[str, ActiveCall] = {}  # session_id -> ActiveCall
         self.available_agents: Dict[str, WebSocket] = {}  # agent_id -> WebSocket
+        # session_id -> callback told when an agent joins (True) or the call ends (False)
+        self.agent_connection_callbacks: Dict[str, Callable[[bool], None]] = {}
         self._lock = asyncio.Lock()
+        # Serialized queue_status message; reset whenever pending_handoffs changes
+        self._queue_snapshot: Optional[str] = None
+        self._queue_snapshot_at = 0.0
+    
+    def set_agent_connection_callback(self, session_id: str, callback: Callable[[bool], None]):
+        """Register a callback for when an agent joins or leaves this session."""
+        self.agent_connection_callbacks[session_id] = callback
+    
+    def _notify_agent_connection(self, session_id: str, connected: bool):
+        callback = self.agent_connection_callbacks.get(session_id)
+        if callback:
+            try:
+                callback(connected)
+            except Exception as e:
+                logger.error(f"[Handoff] Agent connection callback failed: {e}")
     
     async def request_handoff(
         self,
         user_id: str,
         user_ws: WebSocket,
         reason: str,
-        conversation_history: List[Dict[str, str]]
+        conversation_history: List[Dict[str, str]],
+        user_writer: Optional[WebSocketWriter] = None,
     ) -> str:
-        """Add a user to the handoff queue."""
+        """
+        Add a user to the handoff queue (conversation_history is kept by reference, not copied).
+        
+        Pass the call's user_writer so frames sent to the user are queued behind its
+        TTS audio and replies instead of racing them on the socket.
+        """
         async with self._lock:
             handoff = PendingHandoff(
                 user_id=user_id,
@@ -102,8 +165,10 @@ class HandoffManager:
                 reason=reason,
                 requested_at=datetime.now(timezone.utc),
                 conversation_history=conversation_history,
+                user_writer=user_writer,
             )
             self.pending_handoffs[handoff.session_id] = handoff
+            self._queue_snapshot = None
             logger.info(f"[Handoff] User {user_id} added to queue (session: {handoff.session_id})")
             
             # Notify all available agents about new pending call
@@ -112,7 +177,7 @@ class HandoffManager:
                 "session_id": handoff.session_id,
                 "user_id": user_id,
                 "reason": reason,
-                "requested_at": handoff.requested_at.isoformat(),
+                "requested_at": handoff.requested_at_iso,
                 "queue_position": len(self.pending_handoffs),
             })
             
@@ -124,22 +189,29 @@ class HandoffManager:
             self.available_agents[agent_id] = agent_ws
             logger.info(f"[Handoff] Agent {agent_id} registered")
             
-            # Send current queue to agent
-            pending_list = [
-                {
-                    "session_id": h.session_id,
-                    "user_id": h.user_id,
-                    "reason": h.reason,
-                    "requested_at": h.requested_at.isoformat(),
-                    "wait_time_seconds": (datetime.now(timezone.utc) - h.requested_at).total_seconds(),
-                }
-                for h in self.pending_handoffs.values()
-            ]
-            await agent_ws.send_json({
-                "type": "queue_status",
-                "pending_calls": pending_list,
-                "total_pending": len(pending_list),
-            })
+            # Send current queue to agent. The snapshot is rebuilt when the queue
+            # changes, or after a short age so wait times stay roughly current.
+            snapshot = self._queue_snapshot
+            if snapshot is None or time.monotonic() - self._queue_snapshot_at > QUEUE_SNAPSHOT_MAX_AGE_SECONDS:
+                now = datetime.now(timezone.utc)
+                pending_list = [
+                    {
+                        "session_id": h.session_id,
+                        "user_id": h.user_id,
+                        "reason": h.reason,
+                        "requested_at": h.requested_at_iso,
+                        "wait_time_seconds": (now - h.requested_at).total_seconds(),
+                    }
+                    for h in self.pending_handoffs.values()
+                ]
+                snapshot = orjson.dumps({
+                    "type": "queue_status",
+                    "pending_calls": pending_list,
+                    "total_pending": len(pending_list),
+                }).decode()
+                self._queue_snapshot = snapshot
+                self._queue_snapshot_at = time.monotonic()
+            await agent_ws.send_text(snapshot)
     
     async def unregister_agent(self, agent_id: str):
         """Remove an agent from available list."""
@@ -156,6 +228,7 @@ class HandoffManager:
                 return None
             
             handoff = self.pending_handoffs.pop(session_id)
+            self._queue_snapshot = None
             
             # Create active call
             active_call = ActiveCall(
@@ -166,14 +239,16 @@ class HandoffManager:
                 agent_ws=agent_ws,
                 started_at=datetime.now(timezone.utc),
                 conversation_history=handoff.conversation_history,
+                user_writer=handoff.user_writer,
             )
             self.active_calls[session_id] = active_call
+            self._notify_agent_connection(session_id, True)
             
             logger.info(f"[Handoff] Agent {agent_id} accepted call {session_id} from user {handoff.user_id}")
             
             # Notify user that agent connected
             try:
-                await handoff.user_ws.send_json({
+                await _send_json_to_user(handoff.user_ws, handoff.user_writer, {
                     "type": "agent_connected",
                     "message": "You are now connected to a customer service agent.",
                     "session_id": session_id,
@@ -183,7 +258,7 @@ class HandoffManager:
                 logger.error(f"[Handoff] Failed to notify user: {e}")
             
             # Send conversation history to agent
-            await agent_ws.send_json({
+            await send_json_fast(agent_ws, {
                 "type": "call_accepted",
                 "session_id": session_id,
                 "user_id": handoff.user_id,
@@ -205,36 +280,37 @@ class HandoffManager:
         async with self._lock:
             if session_id in self.active_calls:
                 call = self.active_calls.pop(session_id)
+                self._notify_agent_connection(session_id, False)
                 logger.info(f"[Handoff] Call {session_id} ended by {ended_by}")
                 
-                # Notify both parties
-                try:
-                    await call.user_ws.send_json({
+                # Notify both parties concurrently; failures are ignored
+                await asyncio.gather(
+                    _send_json_to_user(call.user_ws, call.user_writer, {
                         "type": "call_ended",
                         "message": "The call with the agent has ended.",
                         "ended_by": ended_by,
-                    })
-                except Exception:
-                    pass
-                
-                try:
-                    await call.agent_ws.send_json({
+                    }),
+                    send_json_fast(call.agent_ws, {
                         "type": "call_ended",
                         "session_id": session_id,
                         "ended_by": ended_by,
-                    })
-                except Exception:
-                    pass
+                    }),
+                    return_exceptions=True,
+                )
             
             # Also remove from pending if still there
             if session_id in self.pending_handoffs:
                 del self.pending_handoffs[session_id]
+                self._queue_snapshot = None
+            self.agent_connection_callbacks.pop(session_id, None)
     
     async def cancel_handoff(self, session_id: str):
         """Cancel a pending handoff (user disconnected)."""
         async with self._lock:
             if session_id in self.pending_handoffs:
                 del self.pending_handoffs[session_id]
+                self._queue_snapshot = None
+                self.agent_connection_callbacks.pop(session_id, None)
                 logger.info(f"[Handoff] Handoff {session_id} cancelled")
                 
                 # Notify agents
@@ -251,10 +327,10 @@ class HandoffManager:
         if session_id in self.active_calls:
             call = self.active_calls[session_id]
             try:
-                # Convert PCM16 to Float32
-                float_audio = pcm16_to_float32(audio_bytes)
-                # Upsample from 16kHz to 44100Hz
-                upsampled = upsample_audio(float_audio, 16000, 44100)
+                # Convert PCM16 16kHz to Float32 44100Hz in the audio worker pool
+                upsampled = await asyncio.get_running_loop().run_in_executor(
+                    _AUDIO_EXECUTOR, pcm16_upsample, audio_bytes, 16000, 44100
+                )
                 await call.agent_ws.send_bytes(upsampled)
             except Exception as e:
                 logger.error(f"[Handoff] Failed to relay audio to agent: {e}")
@@ -267,11 +343,14 @@ class HandoffManager:
         if session_id in self.active_calls:
             call = self.active_calls[session_id]
             try:
-                # Convert PCM16 to Float32
-                float_audio = pcm16_to_float32(audio_bytes)
-                # Upsample from 16kHz to 44100Hz
-                upsampled = upsample_audio(float_audio, 16000, 44100)
-                await call.user_ws.send_bytes(upsampled)
+                # Convert PCM16 16kHz to Float32 44100Hz in the audio worker pool
+                upsampled = await asyncio.get_running_loop().run_in_executor(
+                    _AUDIO_EXECUTOR, pcm16_upsample, audio_bytes, 16000, 44100
+                )
+                if call.user_writer is not None:
+                    call.user_writer.send_bytes(AUDIO_CHUNK + upsampled)
+                else:
+                    await call.user_ws.send_bytes(AUDIO_CHUNK + upsampled)
             except Exception as e:
                 logger.error(f"[Handoff] Failed to relay audio to user: {e}")
     
@@ -280,7 +359,7 @@ class HandoffManager:
         if session_id in self.active_calls:
             call = self.active_calls[session_id]
             try:
-                await call.user_ws.send_json(message)
+                await _send_json_to_user(call.user_ws, call.user_writer, message)
             except Exception as e:
                 logger.error(f"[Handoff] Failed to relay message to user: {e}")
     
@@ -289,19 +368,27 @@ class HandoffManager:
         if session_id in self.active_calls:
             call = self.active_calls[session_id]
             try:
-                await call.agent_ws.send_json(message)
+                await send_json_fast(call.agent_ws, message)
             except Exception as e:
                 logger.error(f"[Handoff] Failed to relay message to agent: {e}")
     
     async def _broadcast_to_agents(self, message: Dict[str, Any], exclude_agent: Optional[str] = None):
-        """Broadcast a message to all available agents."""
-        for agent_id, agent_ws in list(self.available_agents.items()):
-            if agent_id == exclude_agent:
-                continue
-            try:
-                await agent_ws.send_json(message)
-            except Exception as e:
-                logger.error(f"[Handoff] Failed to broadcast to agent {agent_id}: {e}")
+        """Broadcast a message to all available agents concurrently."""
+        # Serialize once; every agent receives the same payload
+        payload = orjson.dumps(message).decode()
+        targets = [
+            (agent_id, agent_ws)
+            for agent_id, agent_ws in self.available_agents.items()
+            if agent_id != exclude_agent
+        ]
+        # Fan out so one slow agent connection doesn't hold up the rest
+        results = await asyncio.gather(
+            *(agent_ws.send_text(payload) for _, agent_ws in targets),
+            return_exceptions=True,
+        )
+        for (agent_id, _), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"[Handoff] Failed to broadcast to agent {agent_id}: {result}")
     
     def get_pending_count(self) -> int:
         """Get number of pending handoffs."""
@@ -384,17 +471,24 @@ async def agent_websocket(ws: WebSocket):
         while True:
             message = await ws.receive()
             
-            if message["type"] == "websocket.disconnect":
-                break
-            
-            if "bytes" in message:
+            # Audio frames dominate this loop, so check for bytes first
+            audio_bytes = message.get("bytes")
+            if audio_bytes is not None:
                 # Audio from agent - relay to user
                 if current_session:
-                    await manager.relay_audio_to_user(current_session, message["bytes"])
+                    await manager.relay_audio_to_user(current_session, audio_bytes)
+                continue
+            
+            if message["type"] == "websocket.disconnect":
+                break
             
-            elif "text" in message:
+            text = message.get("text")
+            if text is not None:
                 try:
-                    data = json.loads(message["text"])
+                    data = orjson.loads(text)
+                    if not isinstance(data, dict):
+                        logger.warning(f"Ignoring non-object JSON from agent {agent_id}")
+                        continue
                     msg_type = data.get("type")
                     
                     if msg_type == "accept_call":
@@ -404,7 +498,7 @@ async def agent_websocket(ws: WebSocket):
                             if call:
                                 current_session = session_id
                             else:
-                                await ws.send_json({
+                                await send_json_fast(ws, {
                                     "type": "error",
                                     "message": "Call not available or already accepted",
                                 })
@@ -425,9 +519,9 @@ async def agent_websocket(ws: WebSocket):
                             })
                     
                     elif msg_type == "ping":
-                        await ws.send_json({"type": "pong"})
+                        await ws.send_text(PONG)
                     
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.warning(f"Invalid JSON from agent {agent_id}")
     
     except WebSocketDisconnect:
@@ -448,13 +542,14 @@ async def agent_websocket(ws: WebSocket):
 async def get_queue_status():
     """Get current handoff queue status."""
     manager = get_handoff_manager()
+    now = datetime.now(timezone.utc)
     pending = [
         {
             "session_id": h.session_id,
             "user_id": h.user_id,
             "reason": h.reason,
-            "requested_at": h.requested_at.isoformat(),
-            "wait_time_seconds": (datetime.now(timezone.utc) - h.requested_at).total_seconds(),
+            "requested_at": h.requested_at_iso,
+            "wait_time_seconds": (now - h.requested_at).total_seconds(),
         }
         for h in manager.pending_handoffs.values()
     ]
@@ -463,8 +558,8 @@ async def get_queue_status():
             "session_id": c.session_id,
             "user_id": c.user_id,
             "agent_id": c.agent_id,
-            "started_at": c.started_at.isoformat(),
-            "duration_seconds": (datetime.now(timezone.utc) - c.started_at).total_seconds(),
+            "started_at": c.started_at_iso,
+            "duration_seconds": (now - c.started_at).total_seconds(),
         }
         for c in manager.active_calls.values()
     ]
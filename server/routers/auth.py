@@ -1,6 +1,7 @@
 """Authentication routes for basic prototype login."""
 
-from datetime import datetime, timedelta, timezone
+import asyncio
+import time
 from typing import Optional
 
 import bcrypt
@@ -13,6 +14,10 @@ from modules.config import ConfigEnv
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+TOKEN_TTL_SECONDS = 12 * 60 * 60
+# Encoded once so jwt.encode doesn't convert the secret on every login
+_JWT_SECRET_KEY = (ConfigEnv.AUTH_JWT_SECRET or "").encode("utf-8")
+
 
 class LoginRequest(BaseModel):
     identifier: str
@@ -50,29 +55,32 @@ async def login(request: LoginRequest) -> LoginResponse:
             detail="Invalid credentials",
         )
 
-    if not bcrypt.checkpw(
-        request.password.encode("utf-8"), user["password_hash"].encode("utf-8")
-    ):
+    # bcrypt is deliberately slow; verify off the event loop
+    password_ok = await asyncio.to_thread(
+        bcrypt.checkpw,
+        request.password.encode("utf-8"),
+        user["password_hash"].encode("utf-8"),
+    )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
-    secret = ConfigEnv.AUTH_JWT_SECRET or ""
-    if not secret:
+    if not _JWT_SECRET_KEY:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="AUTH_JWT_SECRET is not configured",
         )
 
-    now = datetime.now(timezone.utc)
+    iat = int(time.time())
     payload = {
         "sub": user.get("user_id", ""),
         "name": user.get("name", ""),
-        "iat": int(now.timestamp()),
-        "exp": int((now + timedelta(hours=12)).timestamp()),
+        "iat": iat,
+        "exp": iat + TOKEN_TTL_SECONDS,
     }
-    token = jwt.encode(payload, secret, algorithm="HS256")
+    token = jwt.encode(payload, _JWT_SECRET_KEY, algorithm="HS256")
 
     return LoginResponse(
         user=UserResponse(
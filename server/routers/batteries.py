@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Request
 from pydantic import BaseModel
+from pymongo import ReturnDocument
 
 logger = logging.getLogger(__name__)
 
@@ -67,29 +68,21 @@ async def put_battery(battery_id: str, request: Request, body: Optional[BatteryP
             for i in body.issues
         ]
 
-    existing = await db.batteries.find_one({"battery_id": battery_id})
-    if existing:
-        update_op: Dict[str, Any] = {}
-        if set_fields:
-            update_op["$set"] = set_fields
-        if new_issues:
-            update_op["$push"] = {"issues": {"$each": new_issues}}
-        if update_op:
-            await db.batteries.update_one(
-                {"battery_id": battery_id},
-                update_op,
-            )
+    # Single upsert round-trip (battery_id has a unique index, see db/indexes.py);
+    # the filter's battery_id is copied onto newly inserted documents.
+    update_op: Dict[str, Any] = {}
+    if set_fields:
+        update_op["$set"] = set_fields
+    if new_issues:
+        update_op["$push"] = {"issues": {"$each": new_issues}}
     else:
-        # Create new battery document
-        doc: Dict[str, Any] = {
-            "battery_id": battery_id,
-            "issues": new_issues if new_issues else [],
-        }
-        if body.station_id is not None:
-            doc["station_id"] = body.station_id
-        await db.batteries.insert_one(doc)
-
-    battery = await db.batteries.find_one({"battery_id": battery_id})
+        update_op["$setOnInsert"] = {"issues": []}
+    battery = await db.batteries.find_one_and_update(
+        {"battery_id": battery_id},
+        update_op,
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
     return {"status": "ok", "data": _serialize_doc(battery)}
 
 
@@ -1,26 +1,133 @@
 """
 Call Transcripts API - Retrieve stored call transcripts with analytics
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
-from datetime import datetime
+import base64
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
 from db.connection import get_db
 from db.schemas import CallTranscript
 
 router = APIRouter(prefix="/api/calls", tags=["calls"])
 
+# Summary fields returned by the list endpoint; full documents (messages etc.)
+# are only loaded by GET /transcripts/{call_id}
+TRANSCRIPT_LIST_PROJECTION = {
+    "call_id": 1,
+    "user_id": 1,
+    "call_source": 1,
+    "start_time": 1,
+    "duration_seconds": 1,
+    "satisfaction_score": 1,
+    "summary": 1,
+    "detected_language": 1,
+}
+
+
+def _stringify_id(doc: dict) -> dict:
+    """Serialize the document's ObjectId in place and return the document."""
+    if "_id" in doc:
+        doc["_id"] = str(doc["_id"])
+    return doc
+
+
+# Response header carrying the cursor for the page after this one
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_cursor(doc: dict) -> str:
+    """
+    Build an opaque pagination cursor from the last document of a page.
+    Documents without a start_time sort last; their cursor leaves the time empty.
+    """
+    start_time = doc.get("start_time")
+    raw = f"{start_time.isoformat() if start_time else ''}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    """Decode a pagination cursor into (start_time, _id). Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        start_time_iso, last_id = raw.split("|", 1)
+        start_time = datetime.fromisoformat(start_time_iso) if start_time_iso else None
+        return start_time, ObjectId(last_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _after_cursor(last_start_time: Optional[datetime], last_id: ObjectId) -> dict:
+    """Filter for documents after the cursor in (start_time desc, _id desc) order."""
+    if last_start_time is None:
+        # Already into the documents without a start_time, which sort last
+        return {"start_time": None, "_id": {"$lt": last_id}}
+    return {
+        "$or": [
+            {"start_time": {"$lt": last_start_time}},
+            {"start_time": last_start_time, "_id": {"$lt": last_id}},
+            {"start_time": None},
+        ]
+    }
+
+
+def _analytics_facets() -> dict:
+    """$facet branches for the aggregated call statistics and language histogram."""
+    return {
+        "stats": [
+            {
+                "$group": {
+                    "_id": None,
+                    "total_calls": {"$sum": 1},
+                    "avg_satisfaction": {"$avg": "$satisfaction_score"},
+                    "avg_duration": {"$avg": "$duration_seconds"},
+                }
+            }
+        ],
+        "languages": [
+            {"$group": {"_id": "$detected_language", "count": {"$sum": 1}}}
+        ],
+    }
+
+
+def _summary_from_facet(facet: dict, days: int) -> dict:
+    """Shape the stats and languages facet output into the analytics summary."""
+    if not facet.get("stats"):
+        return {
+            "total_calls": 0,
+            "avg_satisfaction_score": 0,
+            "avg_duration_seconds": 0,
+            "language_distribution": {}
+        }
+    
+    stats = facet["stats"][0]
+    lang_dist = {d["_id"]: d["count"] for d in facet.get("languages", [])}
+    
+    return {
+        "total_calls": stats.get("total_calls", 0),
+        "avg_satisfaction_score": round(stats.get("avg_satisfaction", 0), 2),
+        "avg_duration_seconds": round(stats.get("avg_duration", 0), 1),
+        "language_distribution": lang_dist,
+        "period_days": days
+    }
+
 
 @router.get("/transcripts", response_model=List[dict])
 async def get_call_transcripts(
+    response: Response,
     user_id: Optional[str] = Query(None, description="Filter by user ID"),
     call_source: Optional[str] = Query(None, description="Filter by call source (web/twilio)"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
-    skip: int = Query(0, ge=0, description="Number of results to skip for pagination")
+    skip: int = Query(0, ge=0, description="Number of results to skip for pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header")
 ):
     """
     Get call transcripts with AI-generated summaries and satisfaction scores.
     
-    Returns calls sorted by most recent first.
+    Returns call summaries (no messages) sorted by most recent first; use
+    GET /transcripts/{call_id} for the full transcript. The body is the same list
+    as before. For keyset pagination on (start_time, _id), pass the X-Next-Cursor
+    response header back as cursor instead of increasing skip.
     """
     try:
         db = get_db()
@@ -31,18 +138,30 @@ async def get_call_transcripts(
             query_filter["user_id"] = user_id
         if call_source:
             query_filter["call_source"] = call_source
+        if cursor:
+            try:
+                last_start_time, last_id = _decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            query_filter.update(_after_cursor(last_start_time, last_id))
         
         # Query database
-        cursor = db.call_transcripts.find(query_filter).sort("start_time", -1).skip(skip).limit(limit)
-        transcripts = await cursor.to_list(length=limit)
+        db_cursor = (
+            db.call_transcripts.find(query_filter, TRANSCRIPT_LIST_PROJECTION)
+            .sort([("start_time", -1), ("_id", -1)])
+            .skip(skip)
+            .limit(limit)
+            .batch_size(limit)  # whole page in one batch, no getMore
+        )
+        transcripts = [_stringify_id(doc) async for doc in db_cursor]
         
-        # Serialize ObjectId
-        for transcript in transcripts:
-            if "_id" in transcript:
-                transcript["_id"] = str(transcript["_id"])
+        if len(transcripts) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(transcripts[-1])
         
         return transcripts
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve transcripts: {str(e)}")
 
@@ -92,49 +211,69 @@ async def get_call_analytics_summary(
             query_filter["user_id"] = user_id
         
         # Get calls from last N days
-        from datetime import timedelta
-        start_date = datetime.utcnow() - timedelta(days=days)
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
         query_filter["start_time"] = {"$gte": start_date}
         
-        # Aggregate statistics
+        # Aggregate statistics and the language histogram in a single pass
         pipeline = [
             {"$match": query_filter},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_calls": {"$sum": 1},
-                    "avg_satisfaction": {"$avg": "$satisfaction_score"},
-                    "avg_duration": {"$avg": "$duration_seconds"},
-                    "languages": {"$push": "$detected_language"}
-                }
-            }
+            {"$facet": _analytics_facets()},
         ]
         
         result = await db.call_transcripts.aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {}
         
-        if not result:
-            return {
-                "total_calls": 0,
-                "avg_satisfaction_score": 0,
-                "avg_duration_seconds": 0,
-                "language_distribution": {}
-            }
+        return _summary_from_facet(facet, days)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve analytics: {str(e)}")
+
+
+@router.get("/dashboard")
+async def get_call_dashboard(
+    user_id: Optional[str] = Query(None, description="Filter by user ID"),
+    days: int = Query(7, ge=1, le=90, description="Number of days to analyze"),
+    recent_limit: int = Query(10, ge=1, le=100, description="Number of recent calls to include")
+):
+    """
+    Get the analytics summary and the most recent calls in one request.
+    
+    Both sections come from a single $facet aggregation over the same
+    match, so the dashboard needs one round trip instead of two.
+    """
+    try:
+        db = get_db()
+        
+        # Build query filter
+        query_filter = {}
+        if user_id:
+            query_filter["user_id"] = user_id
+        
+        # Get calls from last N days
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        query_filter["start_time"] = {"$gte": start_date}
         
-        stats = result[0]
+        pipeline = [
+            {"$match": query_filter},
+            {
+                "$facet": {
+                    **_analytics_facets(),
+                    "recent": [
+                        {"$sort": {"start_time": -1, "_id": -1}},
+                        {"$limit": recent_limit},
+                        {"$project": TRANSCRIPT_LIST_PROJECTION},
+                    ],
+                }
+            }
+        ]
         
-        # Calculate language distribution
-        languages = stats.get("languages", [])
-        lang_dist = {}
-        for lang in languages:
-            lang_dist[lang] = lang_dist.get(lang, 0) + 1
+        result = await db.call_transcripts.aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {}
         
         return {
-            "total_calls": stats.get("total_calls", 0),
-            "avg_satisfaction_score": round(stats.get("avg_satisfaction", 0), 2),
-            "avg_duration_seconds": round(stats.get("avg_duration", 0), 1),
-            "language_distribution": lang_dist,
-            "period_days": days
+            "summary": _summary_from_facet(facet, days),
+            "recent_calls": [_stringify_id(doc) for doc in facet.get("recent", [])],
         }
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve dashboard: {str(e)}")
@@ -1,13 +1,18 @@
 """Location routes for updating and retrieving user location."""
 
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import asyncio
 import logging
+import time
 
 import httpx
-from fastapi import APIRouter, HTTPException, status, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Header
 from pydantic import BaseModel
 import jwt
+from pymongo import ReturnDocument
 
 from db.connection import get_db
 from modules.config import ConfigEnv
@@ -15,6 +20,36 @@ from modules.config import ConfigEnv
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/location", tags=["location"])
 
+GEOCODE_URL = "https://geocode.maps.co/reverse"
+GEOCODE_CACHE_MAX_ENTRIES = 10000
+GEOCODE_CACHE_TTL_SECONDS = 24 * 60 * 60
+# 4 decimal places is roughly 11m, close enough to share an address
+GEOCODE_COORD_PRECISION = 4
+
+_geo_client: Optional[httpx.AsyncClient] = None
+# (lat, lon) -> (expires_at, address), oldest first
+_geo_cache: "OrderedDict[Tuple[float, float], Tuple[float, str]]" = OrderedDict()
+_geo_inflight: Dict[Tuple[float, float], "asyncio.Future[Optional[str]]"] = {}
+
+
+def get_geo_client() -> httpx.AsyncClient:
+    """Return the shared geocoding HTTP client. Creates it if not yet open."""
+    global _geo_client
+    if _geo_client is None:
+        _geo_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _geo_client
+
+
+async def close_geo_client() -> None:
+    """Close the shared geocoding HTTP client. Called on app shutdown."""
+    global _geo_client
+    if _geo_client is not None:
+        await _geo_client.aclose()
+        _geo_client = None
+
 
 class LocationUpdate(BaseModel):
     """Request body for updating user location."""
@@ -31,97 +66,186 @@ class LocationResponse(BaseModel):
     location: Optional[dict] = None
 
 
+def _geo_cache_get(key: Tuple[float, float]) -> Optional[str]:
+    """Return a cached address for rounded coordinates, dropping it if expired."""
+    entry = _geo_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, address = entry
+    if expires_at <= time.monotonic():
+        del _geo_cache[key]
+        return None
+    return address
+
+
+def _geo_cache_put(key: Tuple[float, float], address: str) -> None:
+    """Store an address, evicting the oldest entries past the size limit."""
+    _geo_cache[key] = (time.monotonic() + GEOCODE_CACHE_TTL_SECONDS, address)
+    _geo_cache.move_to_end(key)
+    while len(_geo_cache) > GEOCODE_CACHE_MAX_ENTRIES:
+        _geo_cache.popitem(last=False)
+
+
+def _geo_cache_key(latitude: float, longitude: float) -> Tuple[float, float]:
+    """Round coordinates to the cache precision."""
+    return (round(latitude, GEOCODE_COORD_PRECISION), round(longitude, GEOCODE_COORD_PRECISION))
+
+
+def cached_address(latitude: float, longitude: float) -> Optional[str]:
+    """Return an already geocoded address for these coordinates, without any I/O."""
+    return _geo_cache_get(_geo_cache_key(latitude, longitude))
+
+
 async def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
     """
     Perform reverse geocoding using geocode.maps.co API.
     Returns a human-readable address or None if geocoding fails.
+    
+    Results are cached per rounded coordinate, and concurrent lookups for
+    the same coordinate share one upstream request.
     """
     api_key = ConfigEnv.GEOCODING_API_KEY
     if not api_key:
         logger.warning("GEOCODING_API_KEY not configured, skipping reverse geocoding")
         return None
     
+    key = _geo_cache_key(latitude, longitude)
+    address = _geo_cache_get(key)
+    if address is not None:
+        return address
+    
+    pending = _geo_inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+    
+    future = asyncio.get_running_loop().create_future()
+    _geo_inflight[key] = future
     try:
-        url = f"https://geocode.maps.co/reverse?lat={latitude}&lon={longitude}&api_key={api_key}"
+        address = await _fetch_address(latitude, longitude, api_key)
+        if address:
+            _geo_cache_put(key, address)
+        future.set_result(address)
+        return address
+    finally:
+        if not future.done():
+            future.set_result(None)
+        del _geo_inflight[key]
+
+
+async def _fetch_address(latitude: float, longitude: float, api_key: str) -> Optional[str]:
+    """Call the geocoding API for a single coordinate."""
+    try:
+        response = await get_geo_client().get(
+            GEOCODE_URL,
+            params={"lat": latitude, "lon": longitude, "api_key": api_key},
+        )
+        
+        if response.status_code != 200:
+            logger.warning(f"Geocoding API returned status {response.status_code}")
+            return None
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            
-            if response.status_code != 200:
-                logger.warning(f"Geocoding API returned status {response.status_code}")
-                return None
-            
-            data = response.json()
-            
-            if "error" in data:
-                logger.warning(f"Geocoding API error: {data['error']}")
-                return None
-            
-            # Get the display_name which contains the full address
-            address = data.get("display_name")
-            if address:
-                logger.info(f"Reverse geocoded location: {address[:50]}...")
-                return address
-            
+        data = response.json()
+        
+        if "error" in data:
+            logger.warning(f"Geocoding API error: {data['error']}")
             return None
+        
+        # Get the display_name which contains the full address
+        address = data.get("display_name")
+        if address:
+            logger.info(f"Reverse geocoded location: {address[:50]}...")
+            return address
+        
+        return None
     except Exception as e:
         logger.error(f"Reverse geocoding failed: {e}")
         return None
 
 
+@lru_cache(maxsize=4)
+def _jwt_key(secret: str) -> bytes:
+    """Encode the signing secret once instead of on every decode."""
+    return secret.encode("utf-8")
+
+
+@lru_cache(maxsize=4096)
+def _decode_token(token: str, secret: str) -> Optional[Tuple[str, Optional[int]]]:
+    """Verify a JWT and return (sub, exp), or None if invalid. Cached per token."""
+    try:
+        payload = jwt.decode(token, _jwt_key(secret), algorithms=["HS256"])
+    except jwt.PyJWTError:
+        return None
+    sub = payload.get("sub")
+    if not sub:
+        return None
+    return sub, payload.get("exp")
+
+
 def get_user_id_from_token(authorization: Optional[str]) -> Optional[str]:
     """Extract user_id from JWT token in Authorization header."""
     if not authorization:
         return None
     
-    try:
-        # Handle "Bearer <token>" format
-        if authorization.startswith("Bearer "):
-            token = authorization[7:]
-        else:
-            token = authorization
-        
-        secret = ConfigEnv.AUTH_JWT_SECRET
-        if not secret:
-            return None
-        
-        payload = jwt.decode(token, secret, algorithms=["HS256"])
-        return payload.get("sub")
-    except Exception:
+    # Handle "Bearer <token>" format
+    if authorization.startswith("Bearer "):
+        token = authorization[7:]
+    else:
+        token = authorization
+    
+    secret = ConfigEnv.AUTH_JWT_SECRET
+    if not secret:
+        return None
+    
+    decoded = _decode_token(token, secret)
+    if decoded is None:
         return None
+    sub, exp = decoded
+    # Cached entries skip verification, so expiry is re-checked here
+    if exp is not None and exp <= time.time():
+        return None
+    return sub
 
 
-@router.post("/update", response_model=LocationResponse)
-async def update_location(
-    location: LocationUpdate,
+async def current_user_id(
     authorization: Optional[str] = Header(None),
-    user_id: Optional[str] = Header(None, alias="X-User-ID"),
-) -> LocationResponse:
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+) -> str:
     """
-    Update the current location of a user.
+    Resolve the calling user for location routes.
     
     The user can be identified via:
     1. JWT token in Authorization header
     2. X-User-ID header
     """
-    # Get user_id from token or header
-    authenticated_user_id = get_user_id_from_token(authorization)
-    final_user_id = authenticated_user_id or user_id
-    
-    if not final_user_id:
+    user_id = get_user_id_from_token(authorization) or x_user_id
+    if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User identification required (token or X-User-ID header)",
         )
+    return user_id
+
+
+@router.post("/update", response_model=LocationResponse)
+async def update_location(
+    location: LocationUpdate,
+    background: BackgroundTasks,
+    final_user_id: str = Depends(current_user_id),
+) -> LocationResponse:
+    """
+    Update the current location of a user.
     
+    The user can be identified via:
+    1. JWT token in Authorization header
+    2. X-User-ID header
+    
+    If no address is given and none is cached, the location is saved without
+    one and reverse geocoding fills it in after the response is sent.
+    """
     try:
         db = get_db()
         
-        # If address not provided, do reverse geocoding
-        address = location.address
-        if not address:
-            logger.info(f"No address provided, performing reverse geocoding for ({location.latitude}, {location.longitude})")
-            address = await reverse_geocode(location.latitude, location.longitude)
+        address = location.address or cached_address(location.latitude, location.longitude)
         
         # Build location document with GeoJSON format for MongoDB geospatial queries
         location_doc = {
@@ -132,26 +256,42 @@ async def update_location(
             "updated_at": datetime.now(timezone.utc),
         }
         
-        # Update user's location
-        result = await db.users.update_one(
+        # Update user's location and read back the stored document in one round trip
+        user = await db.users.find_one_and_update(
             {"user_id": final_user_id},
             {"$set": {"location": location_doc}},
+            projection={"_id": 0, "location": 1},
+            return_document=ReturnDocument.AFTER,
         )
         
-        if result.matched_count == 0:
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User {final_user_id} not found",
             )
         
+        stored = user["location"]
+        coords = stored["coordinates"]
+        
+        if not address:
+            logger.info(f"No address provided, scheduling reverse geocoding for ({location.latitude}, {location.longitude})")
+            background.add_task(
+                _geocode_and_patch,
+                final_user_id,
+                location.latitude,
+                location.longitude,
+                stored["updated_at"],
+            )
+        
         return LocationResponse(
             status="ok",
             message="Location updated successfully",
             location={
-                "latitude": location.latitude,
-                "longitude": location.longitude,
-                "accuracy": location.accuracy,
-                "address": address,
+                "latitude": coords[1],
+                "longitude": coords[0],
+                "accuracy": stored.get("accuracy"),
+                "address": stored.get("address"),
+                "updated_at": stored.get("updated_at"),
             },
         )
     
@@ -164,23 +304,34 @@ async def update_location(
         )
 
 
+async def _geocode_and_patch(
+    user_id: str,
+    latitude: float,
+    longitude: float,
+    updated_at: datetime,
+) -> None:
+    """Reverse geocode a saved location and store the address, unless a newer location replaced it."""
+    address = await reverse_geocode(latitude, longitude)
+    if not address:
+        return
+    
+    try:
+        db = get_db()
+        await db.users.update_one(
+            {"user_id": user_id, "location.updated_at": updated_at},
+            {"$set": {"location.address": address}},
+        )
+    except Exception as e:
+        logger.error(f"Failed to store geocoded address: {e}")
+
+
 @router.get("/current", response_model=LocationResponse)
 async def get_current_location(
-    authorization: Optional[str] = Header(None),
-    user_id: Optional[str] = Header(None, alias="X-User-ID"),
+    final_user_id: str = Depends(current_user_id),
 ) -> LocationResponse:
     """
     Get the current location of a user.
     """
-    authenticated_user_id = get_user_id_from_token(authorization)
-    final_user_id = authenticated_user_id or user_id
-    
-    if not final_user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User identification required",
-        )
-    
     try:
         db = get_db()
         user = await db.users.find_one(
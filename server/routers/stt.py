@@ -5,22 +5,26 @@ then streams TTS response back to client
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import asyncio
-import json
+import orjson
+import threading
 import uuid
 import logging
-from typing import Literal, cast, Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, cast, Dict, List, Optional, Tuple
 from datetime import datetime
 
-import jwt
-
-from services.stt import STTService, VADService
-from services.llm import LLMService
-from services.tts import TTSService
-from services.call_analytics import CallAnalyticsService
+from services.stt import STTService, RecentTranscripts
+from services.llm import get_llm_service
+from services.llm.utils import extract_tool_names
+from services.tts import TTSTurn, get_tts_service
+from services.tts.utils import split_complete_sentences
+from services.call_analytics import get_call_analytics_service
 from modules.config import ConfigEnv
 from modules.response.tool_registry import get_registry
 from db.connection import get_db
 from routers.agent import get_handoff_manager
+from routers.location import get_user_id_from_token
+from routers.ws_utils import AUDIO_START, AUDIO_CHUNK, AUDIO_END, INTERRUPTED, PONG, WebSocketWriter, cancel_and_wait, encode_fragment
 from services.greeting_audio import get_greeting_float32_44100_chunks
 
 TTSLanguage = Literal["hi", "en", "auto"]
@@ -32,19 +36,6 @@ def normalize_tts_language(lang: str) -> TTSLanguage:
         return cast(TTSLanguage, lang)
     return "auto"
 
-def serialize_for_json(obj: Any) -> Any:
-    """Recursively serialize datetime objects and other non-JSON types."""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {key: serialize_for_json(val) for key, val in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [serialize_for_json(item) for item in obj]
-    elif hasattr(obj, "isoformat"):  # Handle other date/time types
-        return obj.isoformat()
-    return obj
-
-
 # =========================
 # Router Setup
 # =========================
@@ -57,6 +48,19 @@ SILENCE_LIMIT_CHUNKS = 15  # ~0.5s of silence to trigger LLM
 # Silero VAD requires at least 512 samples (32ms at 16kHz) per chunk
 VAD_MIN_SAMPLES = 512
 VAD_MIN_BYTES = VAD_MIN_SAMPLES * 2  # PCM16
+# Inbound audio waiting to be written to Soniox (~8s of 32ms chunks)
+STT_QUEUE_MAXSIZE = 256
+# Final transcripts waiting for the transcript loop
+STT_EVENT_QUEUE_MAXSIZE = 128
+# Partials arriving within this window after one is sent are collapsed into the latest one
+PARTIAL_DEBOUNCE_SECONDS = 0.05
+# TTS audio is sent in frames of up to this many PCM bytes (~93ms of float32 44.1kHz)
+AUDIO_FLUSH_BYTES = 16384
+# response_stream updates are sent every this many tokens, or sooner once this much time passed
+STREAM_FLUSH_TOKENS = 4
+STREAM_FLUSH_SECONDS = 0.02
+# Conversation turns echoed back to the client with each LLM response
+HISTORY_WINDOW = 10
 
 
 # =========================
@@ -83,13 +87,15 @@ async def audio_websocket(ws: WebSocket):
     Message Types Sent to Client:
     - {"type": "transcript", "text": "..."} - Partial transcripts
     - {"type": "llm_response", "transcript": "...", "response": "...", "intent": {...}, ...} - LLM result
-    - {"type": "audio_start"} - Indicates TTS audio streaming begins
-    - Audio bytes (raw PCM float32 at 44100Hz) - TTS audio chunks
-    - {"type": "audio_end"} - Indicates TTS audio streaming complete
-    - {"type": "interrupted"} - TTS was interrupted by new speech
+    
+    Binary frames (first byte is the tag):
+    - 0x01 - Indicates TTS audio streaming begins
+    - 0x02 + audio bytes (raw PCM float32 at 44100Hz) - TTS audio chunks
+    - 0x03 - Indicates TTS audio streaming complete
+    - 0x04 - TTS was interrupted by new speech
     """
     await ws.accept()
-    print("✅ WebSocket connected")
+    logger.info("✅ WebSocket connected")
 
     user_id = None
     call_id = str(uuid.uuid4())  # Unique identifier for this call
@@ -102,25 +108,20 @@ async def audio_websocket(ws: WebSocket):
         user_id_param = ws.query_params.get("user_id")
 
         if token and ConfigEnv.AUTH_JWT_SECRET:
-            try:
-                payload = jwt.decode(
-                    token,
-                    ConfigEnv.AUTH_JWT_SECRET,
-                    algorithms=["HS256"],
-                )
-                decoded_user = payload.get("sub")
-                if decoded_user:
-                    user_id = decoded_user
-                    logger.info(f"[STT] user_id from JWT: {user_id}")
-            except Exception as exc:
-                logger.warning("Failed to decode JWT token: %s", exc)
+            # Shares the cached HS256 verifier with the location routes
+            decoded_user = get_user_id_from_token(token)
+            if decoded_user:
+                user_id = decoded_user
+                logger.info(f"[STT] user_id from JWT: {user_id}")
+            else:
+                logger.warning("Failed to decode JWT token")
 
         if user_id_param and not user_id:
             user_id = user_id_param
             logger.info(f"[STT] user_id from query param: {user_id}")
 
         if not user_id:
-            await ws.send_json({
+            writer.send_json({
                 "type": "user_info",
                 "status": "error",
                 "message": "Missing user identifier",
@@ -130,21 +131,27 @@ async def audio_websocket(ws: WebSocket):
         try:
             registry = get_registry()
             result = await registry.execute_tool("getUserInfo", {"userId": user_id})
-            await ws.send_json({
+            writer.send_json({
                 "type": "user_info",
                 "user_id": user_id,
                 "result": result,
             })
         except Exception as exc:
-            await ws.send_json({
+            writer.send_json({
                 "type": "user_info",
                 "user_id": user_id,
                 "status": "error",
                 "message": str(exc),
             })
 
-    await send_user_info()
-    print(f"🔑 After send_user_info: user_id = {user_id}")
+    # Everything sent from here on goes through one writer task, so producers
+    # queue frames instead of awaiting the socket
+    writer = WebSocketWriter(ws)
+    writer.start()
+
+    # Look the user up while Soniox connects and the greeting plays; the LLM
+    # turn waits for it since that's where user_id is first needed
+    user_info_task = asyncio.create_task(send_user_info())
 
     # State tracking
     conversation_history = []  # Store conversation: [{"role": "user", "text": "..."}, {"role": "assistant", "text": "..."}]
@@ -155,32 +162,37 @@ async def audio_websocket(ws: WebSocket):
     # Handoff state
     handoff_manager = get_handoff_manager()
     handoff_session_id: Optional[str] = None  # Track if user is in handoff queue or active call
-    is_agent_connected = False  # Track if agent has joined the call
+    is_agent_connected = False  # Set by the handoff manager when an agent joins or leaves
     
-    async def check_agent_connected():
-        """Check if an agent has connected to this user's call."""
-        nonlocal is_agent_connected, handoff_session_id
-        if handoff_session_id and handoff_session_id in handoff_manager.active_calls:
-            if not is_agent_connected:
-                is_agent_connected = True
-                print(f"🎧 Agent connected to session {handoff_session_id}")
-            return True
-        is_agent_connected = False
-        return False
+    def on_agent_connection(connected: bool):
+        """Track agent presence; called by the handoff manager, so nothing polls for it."""
+        nonlocal is_agent_connected
+        if connected and not is_agent_connected:
+            logger.info(f"🎧 Agent connected to session {handoff_session_id}")
+        is_agent_connected = connected
     
     # Utterance accumulation state
-    current_utterance_parts = []  # Accumulate transcripts from same utterance
-    utterance_timer_task = None  # Timer to finalize utterance after pause
+    current_utterance = ""  # Final transcripts of the current utterance, space-joined as they arrive
+    recent_transcripts = RecentTranscripts()  # Drop finals re-sent for the same audio
     UTTERANCE_TIMEOUT = 1.0  # Seconds to wait before finalizing utterance
     
     # Get event loop for scheduling tasks from callback thread
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
+    loop_thread_id = threading.get_ident()
+    call_soon_threadsafe = loop.call_soon_threadsafe
+    
+    def run_on_loop(callback, *args):
+        """Run callback on the event loop, skipping the thread-safe wakeup when already on it."""
+        if threading.get_ident() == loop_thread_id:
+            callback(*args)
+        else:
+            call_soon_threadsafe(callback, *args)
     
     # Initialize services
-    vad_service = VADService()
-    llm_service = LLMService()
-    tts_service = TTSService()
-    analytics_service = CallAnalyticsService()
+    # Shared across calls; per-call state lives in this handler
+    llm_service = get_llm_service()
+    tts_service = get_tts_service()
+    analytics_service = get_call_analytics_service()
     
     async def save_call_transcript():
         """Save complete call transcript with AI-generated insights to database."""
@@ -188,20 +200,20 @@ async def audio_websocket(ws: WebSocket):
         
         try:
             if not conversation_history:
-                print("⚠️  No conversation to save")
+                logger.warning("⚠️  No conversation to save")
                 return
             
             call_end_time = datetime.utcnow()
             duration_seconds = int((call_end_time - call_start_time).total_seconds())
             
-            print(f"📊 Analyzing call transcript ({len(conversation_history)} messages)...")
+            logger.info(f"📊 Analyzing call transcript ({len(conversation_history)} messages)...")
             
             # Generate AI insights
             analysis = await analytics_service.analyze_call(conversation_history)
             
-            print(f"✅ Analysis complete:")
-            print(f"   Summary: {analysis['summary'][:100]}...")
-            print(f"   Satisfaction: {analysis['satisfaction_score']}/5 - {analysis['satisfaction_reasoning']}")
+            logger.info(f"✅ Analysis complete:")
+            logger.info(f"   Summary: {analysis['summary'][:100]}...")
+            logger.info(f"   Satisfaction: {analysis['satisfaction_score']}/5 - {analysis['satisfaction_reasoning']}")
             
             # Prepare call transcript document
             call_data = {
@@ -230,32 +242,31 @@ async def audio_websocket(ws: WebSocket):
             db = get_db()
             await db.call_transcripts.insert_one(call_data)
             
-            print(f"✅ Call transcript saved: {call_id}")
+            logger.info(f"✅ Call transcript saved: {call_id}")
         
         except Exception as e:
-            print(f"❌ Error saving call transcript: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"❌ Error saving call transcript: {e}", exc_info=True)
     
     async def finalize_utterance():
         """Finalize accumulated utterance and trigger LLM processing"""
-        nonlocal current_utterance_parts, tts_task, is_agent_connected
+        nonlocal current_utterance, tts_task, is_agent_connected
         
-        if not current_utterance_parts:
+        if not current_utterance:
             return
         
-        # Combine all parts into one user message
-        full_text = " ".join(current_utterance_parts).strip()
-        current_utterance_parts.clear()
+        # The utterance is already one string; take it and start a new one
+        full_text = current_utterance.strip()
+        current_utterance = ""
+        recent_transcripts.clear()
         
         if not full_text:
             return
         
-        print(f"✅ Utterance finalized: {full_text}")
+        logger.info(f"✅ Utterance finalized: {full_text}")
         
         # Check if agent is connected - if so, just relay transcript, don't process with LLM
-        if await check_agent_connected() and handoff_session_id:
-            print(f"🎧 Agent connected - skipping LLM, relaying transcript")
+        if is_agent_connected and handoff_session_id:
+            logger.info(f"🎧 Agent connected - skipping LLM, relaying transcript")
             # Send transcript to agent for display
             await handoff_manager.relay_message_to_agent(handoff_session_id, {
                 "type": "user_transcript",
@@ -271,12 +282,8 @@ async def audio_websocket(ws: WebSocket):
         
         # Cancel any ongoing TTS if user spoke
         if tts_task and not tts_task.done():
-            print("🛑 Interrupting previous response - New user utterance")
-            tts_task.cancel()
-            try:
-                await tts_task
-            except asyncio.CancelledError:
-                pass
+            logger.info("🛑 Interrupting previous response - New user utterance")
+            await cancel_and_wait(tts_task)
         
         # Add to conversation history as user message
         conversation_history.append({
@@ -287,74 +294,115 @@ async def audio_websocket(ws: WebSocket):
         # Trigger LLM processing
         tts_task = asyncio.create_task(process_and_respond())
     
+    # Partial transcripts queued from the Soniox thread, sent in order by one task
+    outbound: asyncio.Queue = asyncio.Queue()
+    
+    async def sender_loop():
+        """Send queued partial transcripts to the client (and agent, if connected)."""
+        last_sent_text = None
+        
+        async def send_partial(msg):
+            nonlocal last_sent_text
+            if msg["text"] == last_sent_text:
+                return
+            last_sent_text = msg["text"]
+            try:
+                writer.send_json(msg)
+                # Also send to agent if connected
+                if is_agent_connected and handoff_session_id:
+                    await handoff_manager.relay_message_to_agent(handoff_session_id, {
+                        "type": "user_transcript",
+                        "text": msg["text"],
+                        "language": msg["language"],
+                    })
+            except Exception as e:
+                logger.warning("⚠️  Failed to send partial transcript: %s", e)
+        
+        while True:
+            msg = await outbound.get()
+            # The first partial after a quiet spell goes out at once; any that
+            # arrive within the next window are collapsed into the newest
+            while True:
+                await send_partial(msg)
+                await asyncio.sleep(PARTIAL_DEBOUNCE_SECONDS)
+                if outbound.empty():
+                    break
+                while not outbound.empty():
+                    msg = outbound.get_nowait()
+    
     # STT service with callbacks
     def on_partial_transcript(text: str, language: str):
         """Handle streaming partial transcripts for real-time feedback"""
-        nonlocal detected_language, current_utterance_parts
+        nonlocal detected_language
         
         # Log language changes
         if detected_language != language:
-            print(f"🌐 Language changed: {detected_language} → {language}")
+            logger.info("🌐 Language changed: %s → %s", detected_language, language)
         
         # Store detected language
         detected_language = language
         
         # Send partial transcripts to client for real-time display
         # Include accumulated text so far
-        accumulated = " ".join(current_utterance_parts)
-        full_partial = (accumulated + " " + text).strip() if accumulated else text
-        
-        # Use call_soon_threadsafe since this callback runs in Soniox's thread
-        async def send_partial():
-            await ws.send_json({
-                "type": "partial_transcript",
-                "text": full_partial,
-                "language": language
-            })
-            # Also send to agent if connected
-            if is_agent_connected and handoff_session_id:
-                await handoff_manager.relay_message_to_agent(handoff_session_id, {
-                    "type": "user_transcript",
-                    "text": full_partial,
-                    "language": language,
-                })
+        full_partial = f"{current_utterance} {text}".strip() if current_utterance else text
         
-        loop.call_soon_threadsafe(lambda: asyncio.create_task(send_partial()))
+        # This callback normally runs in Soniox's thread: hand the message to
+        # the sender loop instead of creating a task per partial
+        run_on_loop(outbound.put_nowait, {
+            "type": "partial_transcript",
+            "text": full_partial,
+            "language": language
+        })
+    
+    # Final transcripts queued from the Soniox thread, consumed by one long-lived task
+    final_transcripts: asyncio.Queue = asyncio.Queue(maxsize=STT_EVENT_QUEUE_MAXSIZE)
+    
+    def queue_final_transcript(text: str, span: Optional[Tuple[int, int]]):
+        try:
+            final_transcripts.put_nowait((text, span))
+        except asyncio.QueueFull:
+            logger.warning("[STT] Transcript queue full, dropping final transcript")
     
-    def on_transcript(text: str, language: str):
-        nonlocal detected_language, current_utterance_parts, utterance_timer_task
+    async def transcript_loop():
+        """Accumulate final transcripts and finalize the utterance after a pause."""
+        nonlocal current_utterance
+        while True:
+            # Only wait with a deadline while an utterance is open
+            timeout = UTTERANCE_TIMEOUT if current_utterance else None
+            try:
+                text, span = await asyncio.wait_for(final_transcripts.get(), timeout)
+            except TimeoutError:
+                try:
+                    await finalize_utterance()
+                except Exception as e:
+                    logger.error("❌ Error finalizing utterance: %s", e, exc_info=True)
+                continue
+            
+            # Skip finals Soniox re-sent for audio already in this utterance
+            if not recent_transcripts.add(text, span):
+                continue
+            
+            # Accumulate transcript part
+            logger.debug("📝 Final Transcript: %s", text)
+            current_utterance = f"{current_utterance} {text}" if current_utterance else text
+    
+    def on_transcript(text: str, language: str, span: Optional[Tuple[int, int]] = None):
+        nonlocal detected_language
         
         # Log language changes
         if detected_language != language:
-            print(f"🌐 Language changed: {detected_language} → {language}")
+            logger.info("🌐 Language changed: %s → %s", detected_language, language)
         
         # Store detected language
         detected_language = language
         
-        # Accumulate transcript part
-        print(f"📝 Final Transcript ({language}): {text}")
-        current_utterance_parts.append(text)
-        
-        # Cancel existing timer if any
-        if utterance_timer_task and not utterance_timer_task.done():
-            utterance_timer_task.cancel()
-        
-        # Start new timer to finalize utterance after pause
-        # Use call_soon_threadsafe since this callback runs in Soniox's thread
-        def schedule_timer():
-            nonlocal utterance_timer_task
-            
-            async def timer():
-                await asyncio.sleep(UTTERANCE_TIMEOUT)
-                await finalize_utterance()
-            
-            utterance_timer_task = asyncio.create_task(timer())
-        
-        loop.call_soon_threadsafe(schedule_timer)
+        # This callback normally runs in Soniox's thread; the transcript loop
+        # does the rest on the event loop
+        run_on_loop(queue_final_transcript, text, span)
     
 
     def on_error(error: str):
-        print(f"❌ STT Error: {error}")
+        logger.error("❌ STT Error: %s", error)
     
     stt_service = STTService(
         on_transcript=on_transcript,
@@ -362,40 +410,71 @@ async def audio_websocket(ws: WebSocket):
         on_error=on_error
     )
     
+    # All Soniox calls (connect, writes, disconnect) go through one dedicated
+    # thread; writes are fed from a queue, so the receive loop never waits on a
+    # thread hop per audio chunk
+    stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-writer")
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=STT_QUEUE_MAXSIZE)
+    
     # Connect to Soniox
-    await asyncio.to_thread(stt_service.connect)
-    print("🎙️  Connected to Soniox - Ready to receive audio")
+    await loop.run_in_executor(stt_executor, stt_service.connect)
+    logger.info("🎙️  Connected to Soniox - Ready to receive audio")
+
+    async def stt_writer():
+        """Drain queued audio and stream it to Soniox in batches."""
+        # Backlogs are joined into one reused buffer; it is only touched again
+        # after the executor has finished sending it
+        batch = bytearray()
+        while True:
+            payload = await audio_queue.get()
+            if not audio_queue.empty():
+                batch[:] = payload
+                while not audio_queue.empty():
+                    batch += audio_queue.get_nowait()
+                payload = batch
+            try:
+                await loop.run_in_executor(stt_executor, stt_service.stream, payload)
+            except Exception as e:
+                logger.error("⚠️  STT streaming error: %s", e)
+                # Continue processing, don't crash on STT errors
+
+    stt_writer_task = asyncio.create_task(stt_writer())
+    sender_task = asyncio.create_task(sender_loop())
+    transcript_task = asyncio.create_task(transcript_loop())
 
     # Play greeting audio (float32 44100 Hz) at call start
-    await ws.send_json({"type": "audio_start"})
+    writer.send_bytes(AUDIO_START)
     for chunk in get_greeting_float32_44100_chunks(chunk_size=4096):
-        await ws.send_bytes(chunk)
-    await ws.send_json({"type": "audio_end"})
+        writer.send_bytes(AUDIO_CHUNK + chunk)
+    writer.send_bytes(AUDIO_END)
 
     async def process_and_respond():
         """Process transcript with LLM and stream TTS response"""
         nonlocal tts_task, user_id, conversation_history, handoff_session_id, is_agent_connected
         
         # Use lock to prevent concurrent processing
+        if not user_info_task.done():
+            await asyncio.wait([user_info_task])
+        
         async with processing_lock:
+            # An agent may have joined while this turn was waiting for the lock;
+            # the agent answers from here on, so don't run the LLM or stream to the client
+            if is_agent_connected and handoff_session_id:
+                logger.info("🎧 Agent connected - skipping queued LLM turn")
+                return
+
             # Get the last user message from history
             if not conversation_history or conversation_history[-1]["role"] != "user":
-                print("⚠️  No user message to process")
+                logger.warning("⚠️  No user message to process")
                 return
             
             full_transcript = conversation_history[-1]["text"]
-            print(f"🔐 process_and_respond: user_id = {user_id}")
-            print(f"📄 Processing transcript: {full_transcript}")
-            
-            # Add user message to conversation history
-            conversation_history.append({
-                "role": "user",
-                "text": full_transcript
-            })
+            logger.debug("🔐 process_and_respond: user_id = %s", user_id)
+            logger.info(f"📄 Processing transcript: {full_transcript}")
             
             # Process with LLM pipeline (streaming)
-            print(f"🤖 Calling LLM service (streaming) with conversation context ({len(conversation_history)} turns)...")
-            print(f"🔑 user_id being passed to LLM: {user_id}")
+            logger.debug("🤖 Calling LLM service (streaming) with conversation context (%d turns)...", len(conversation_history))
+            logger.debug("🔑 user_id being passed to LLM: %s", user_id)
             llm_result = await llm_service.process_stream(
                 full_transcript,
                 conversation_history,
@@ -403,19 +482,13 @@ async def audio_websocket(ws: WebSocket):
             )
 
             stream = llm_result.get("stream")
-            print(f"🎯 Intent: {llm_result.get('intent', {}).get('intent', 'unknown')}")
+            logger.info(f"🎯 Intent: {llm_result.get('intent', {}).get('intent', 'unknown')}")
 
             # Extract tool names
-            tool_calls_raw = llm_result.get('tool_calls', [])
-            tool_names = []
-            for tc in tool_calls_raw:
-                if isinstance(tc, dict):
-                    tool_names.append(tc.get('name', tc.get('tool_name', 'unknown')))
-                elif isinstance(tc, str):
-                    tool_names.append(tc)
+            tool_names = extract_tool_names(llm_result.get('tool_calls', []))
 
             if tool_names:
-                print(f"🔧 Tools used: {tool_names}")
+                logger.info(f"🔧 Tools used: {tool_names}")
             
             # Check if requestHumanAgent tool was called
             tool_results = llm_result.get("tool_results", [])
@@ -427,157 +500,192 @@ async def audio_websocket(ws: WebSocket):
                         # Add user to handoff queue
                         handoff_data = tool_output.get("data", {})
                         reason = handoff_data.get("reason", "User requested human agent")
-                        print(f"📞 Handoff requested: {reason}")
+                        logger.info(f"📞 Handoff requested: {reason}")
                         
                         if user_id and not handoff_session_id:
                             handoff_session_id = await handoff_manager.request_handoff(
                                 user_id=user_id,
                                 user_ws=ws,
                                 reason=reason,
-                                conversation_history=conversation_history.copy(),
+                                # Shared rather than copied: turns never change once appended,
+                                # and the agent then sees what was said while the user waited
+                                conversation_history=conversation_history,
+                                user_writer=writer,
                             )
+                            handoff_manager.set_agent_connection_callback(handoff_session_id, on_agent_connection)
                             
                             # Notify client about handoff queue
-                            await ws.send_json({
+                            writer.send_json({
                                 "type": "handoff_queued",
                                 "session_id": handoff_session_id,
                                 "message": "You have been added to the queue. A customer service agent will be with you shortly.",
                             })
-                            print(f"✅ User {user_id} added to handoff queue (session: {handoff_session_id})")
+                            logger.info(f"✅ User {user_id} added to handoff queue (session: {handoff_session_id})")
 
-            # Notify client that LLM streaming is starting
-            await ws.send_json(serialize_for_json({
-                "type": "llm_start",
+            # Recent history window shared by the llm_start and llm_response messages
+            recent_history = conversation_history[-HISTORY_WINDOW:]
+
+            # Fields shared by llm_start and llm_response; tool results can be large,
+            # so they are encoded once and embedded in both
+            turn_fields = {
                 "transcript": full_transcript,
-                "intent": llm_result.get("intent", {}),
+                "intent": encode_fragment(llm_result.get("intent", {})),
                 "tool_calls": tool_names,
-                "tool_results": llm_result.get("tool_results", []),
-                "conversation_history": conversation_history[-10:],
-            }))
+                "tool_results": encode_fragment(llm_result.get("tool_results", [])),
+            }
 
-            async def stream_with_last(async_iter):
-                it = async_iter.__aiter__()
-                try:
-                    prev = await it.__anext__()
-                except StopAsyncIteration:
-                    return
-                while True:
-                    try:
-                        curr = await it.__anext__()
-                        yield prev, False
-                        prev = curr
-                    except StopAsyncIteration:
-                        yield prev, True
-                        return
+            # Notify client that LLM streaming is starting
+            writer.send_json({
+                "type": "llm_start",
+                **turn_fields,
+                "conversation_history": recent_history,
+            })
 
             response_text = ""
-            tts_context_id = f"tts-{uuid.uuid4()}"
+            tts_buffer = ""  # LLM text not yet sent to TTS
+            # One TTS context per turn; its language is pinned on the first sentence
+            tts_turn = TTSTurn(tts_service, normalize_tts_language(detected_language))
+            logger.debug("🔊 TTS using language: %s (detected: %s)", tts_turn.language, detected_language)
             tts_started = False
             audio_chunk_count = 0
+            # Reads the turn's TTS audio while the LLM is still streaming, so each
+            # sentence plays out in full instead of waiting for the next one
+            playback_task: Optional[asyncio.Task] = None
+
+            async def play_audio():
+                """Frame this turn's TTS audio for the client as Cartesia produces it."""
+                nonlocal audio_chunk_count
+                # Tagged frame being filled with TTS audio; flushed when full or
+                # when no more audio is queued
+                audio_frame = bytearray(AUDIO_CHUNK)
+                async for batch in tts_turn.receive():
+                    for audio_chunk in batch:
+                        audio_frame.extend(audio_chunk)
+                        audio_chunk_count += 1
+                        if len(audio_frame) > AUDIO_FLUSH_BYTES:
+                            writer.send_bytes(bytes(audio_frame))
+                            del audio_frame[1:]
+                    if len(audio_frame) > 1:
+                        writer.send_bytes(bytes(audio_frame))
+                        del audio_frame[1:]
+
+            async def speak(text: str, continue_flag: bool):
+                """Send text into this turn's TTS context; play_audio sends the audio."""
+                nonlocal tts_started, playback_task
+                if not tts_started:
+                    writer.send_bytes(AUDIO_START)
+                    tts_started = True
+                await tts_turn.send(text, continue_flag)
+                if playback_task is None:
+                    playback_task = asyncio.create_task(play_audio())
 
             if stream:
-                async for text_chunk, is_last in stream_with_last(stream):
-                    # Check for interruption
-                    current_task = asyncio.current_task()
-                    if current_task and current_task.cancelled():
-                        print("⚠️  LLM streaming interrupted")
-                        await ws.send_json({"type": "interrupted"})
-                        return
-
-                    response_text += text_chunk
-                    await ws.send_json({
-                        "type": "response_stream",
-                        "text": response_text.strip()
-                    })
-
-                    if tts_service.enabled and text_chunk.strip():
-                        if not tts_started:
-                            await ws.send_json({"type": "audio_start"})
-                            tts_started = True
-
-                        try:
-                            tts_language = normalize_tts_language(detected_language)
-                            print(f"🔊 TTS using language: {tts_language} (detected: {detected_language})")
-                            async for audio_chunk in tts_service.stream_tts_chunk(
-                                transcript=text_chunk,
-                                context_id=tts_context_id,
-                                continue_flag=not is_last,
-                                language=tts_language,
-                            ):
-                                current_task = asyncio.current_task()
-                                if current_task and current_task.cancelled():
-                                    print("⚠️  TTS streaming interrupted")
-                                    await ws.send_json({"type": "interrupted"})
-                                    return
-
-                                await ws.send_bytes(audio_chunk)
-                                audio_chunk_count += 1
-                        except asyncio.CancelledError:
-                            print("⚠️  TTS streaming cancelled by interruption")
-                            await ws.send_json({"type": "interrupted"})
-                            raise
+                # Interruption cancels this task, which surfaces as CancelledError at the next await
+                pending_tokens = 0
+                last_stream_send = loop.time()
+                try:
+                    async for text_chunk in stream:
+                        # Each update carries the full text so far, so skipped ones lose nothing
+                        response_text += text_chunk
+                        pending_tokens += 1
+                        now = loop.time()
+                        if pending_tokens >= STREAM_FLUSH_TOKENS or now - last_stream_send >= STREAM_FLUSH_SECONDS:
+                            writer.send_json({
+                                "type": "response_stream",
+                                "text": response_text.strip()
+                            })
+                            pending_tokens = 0
+                            last_stream_send = now
+
+                        # Batch tokens into whole sentences so each TTS request carries real text
+                        if tts_service.enabled:
+                            tts_buffer += text_chunk
+                            sentence, tts_buffer = split_complete_sentences(tts_buffer)
+                            if sentence.strip():
+                                await speak(sentence, continue_flag=True)
+
+                    if pending_tokens:
+                        writer.send_json({
+                            "type": "response_stream",
+                            "text": response_text.strip()
+                        })
+
+                    # Speak whatever is left and close the TTS context; an empty
+                    # transcript with continue=False just closes it
+                    if tts_buffer.strip() or tts_started:
+                        await speak(tts_buffer, continue_flag=False)
+                    # The context is closed; wait for the rest of its audio
+                    if playback_task is not None:
+                        await playback_task
+                except asyncio.CancelledError:
+                    logger.warning("⚠️  LLM/TTS streaming cancelled by interruption")
+                    writer.send_bytes(INTERRUPTED)
+                    raise
+                finally:
+                    await cancel_and_wait(playback_task)
 
                 if tts_started:
-                    await ws.send_json({"type": "audio_end"})
-                    print(f"✅ TTS streaming complete ({audio_chunk_count} chunks)\n")
+                    writer.send_bytes(AUDIO_END)
+                    logger.info(f"✅ TTS streaming complete ({audio_chunk_count} chunks)")
 
             # Add assistant response to conversation history
-            conversation_history.append({
+            assistant_message = {
                 "role": "assistant",
                 "text": response_text
-            })
+            }
+            conversation_history.append(assistant_message)
+            recent_history.append(assistant_message)
+            del recent_history[:-HISTORY_WINDOW]
 
             # Send final LLM metadata to client
-            await ws.send_json(serialize_for_json({
+            writer.send_json({
                 "type": "llm_response",
-                "transcript": full_transcript,
+                **turn_fields,
                 "response": response_text,
-                "intent": llm_result.get("intent", {}),
-                "tool_calls": tool_names,
-                "tool_results": llm_result.get("tool_results", []),
-                "conversation_history": conversation_history[-10:]
-            }))
+                "conversation_history": recent_history
+            })
 
-            print("✅ Sent final LLM response metadata to client")
+            logger.debug("✅ Sent final LLM response metadata to client")
 
+    # Bound once; these run for every ~30ms audio frame
+    receive = ws.receive
+    queue_audio = audio_queue.put_nowait
+    
     try:
         while True:
-            # Receive message (could be audio bytes or JSON)
-            message = await ws.receive()
-            
-            if message["type"] == "websocket.disconnect":
-                break
+            # Receive message (could be audio bytes or JSON). ws.receive() is kept over
+            # iter_bytes() because pings arrive as text frames on the same socket.
+            message = await receive()
             
-            if "bytes" in message:
-                audio_bytes = message["bytes"]
-                
-                # Check if agent is connected
-                agent_connected = await check_agent_connected()
-                
-                if agent_connected and handoff_session_id:
+            # Audio is the common case, so it is checked first with a single lookup
+            audio_bytes = message.get("bytes")
+            if audio_bytes is not None:
+                if is_agent_connected and handoff_session_id:
                     # Relay audio to agent
                     await handoff_manager.relay_audio_to_agent(handoff_session_id, audio_bytes)
                 
                 # Always stream to Soniox for transcription (useful for agent to see transcript)
                 try:
-                    await asyncio.to_thread(stt_service.stream, audio_bytes)
-                except Exception as e:
-                    print(f"⚠️  STT streaming error: {e}")
-                    # Continue processing, don't crash on STT errors
+                    queue_audio(audio_bytes)
+                except asyncio.QueueFull:
+                    logger.warning("[STT] Audio queue full, dropping chunk")
+            
+            elif message["type"] == "websocket.disconnect":
+                break
             
-            elif "text" in message:
+            elif message.get("text") is not None:
                 # Handle JSON messages from client
                 try:
-                    data = json.loads(message["text"])
+                    data = orjson.loads(message["text"])
                     msg_type = data.get("type")
                     
                     if msg_type == "ping":
-                        await ws.send_json({"type": "pong"})
-                except json.JSONDecodeError:
+                        writer.send_text(PONG)
+                except orjson.JSONDecodeError:
                     pass
 
     except WebSocketDisconnect:
-        print("✋ Client disconnected")
+        logger.info("✋ Client disconnected")
         if tts_task and not tts_task.done():
             tts_task.cancel()
         # Clean up handoff if user was in queue or call
@@ -585,9 +693,7 @@ async def audio_websocket(ws: WebSocket):
             await handoff_manager.cancel_handoff(handoff_session_id)
             await handoff_manager.end_call(handoff_session_id, ended_by="user_disconnect")
     except Exception as e:
-        print(f"❌ WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ WebSocket error: {e}", exc_info=True)
         if tts_task and not tts_task.done():
             tts_task.cancel()
         # Clean up handoff on error
@@ -595,15 +701,26 @@ async def audio_websocket(ws: WebSocket):
             await handoff_manager.cancel_handoff(handoff_session_id)
             await handoff_manager.end_call(handoff_session_id, ended_by="error")
     finally:
+        # Stop anything that could still start or run a turn, so nothing is
+        # sent to the closed socket or added to the history after it is saved.
+        # The transcript loop goes first since finalizing an utterance starts a turn.
+        await cancel_and_wait(transcript_task)
+        await cancel_and_wait(sender_task)
+        await cancel_and_wait(user_info_task)
+        await cancel_and_wait(tts_task)
+        
         # Save call transcript with analytics
         await save_call_transcript()
         
         # Cleanup
+        stt_writer_task.cancel()
+        await writer.close()
         try:
-            await asyncio.to_thread(stt_service.disconnect)
-            print("🔌 Disconnected from Soniox")
+            await loop.run_in_executor(stt_executor, stt_service.disconnect)
+            logger.info("🔌 Disconnected from Soniox")
         except Exception as e:
-            print(f"⚠️  Error disconnecting from Soniox: {e}")
+            logger.warning(f"⚠️  Error disconnecting from Soniox: {e}")
+        stt_executor.shutdown(wait=False)
 
 
 # =========================
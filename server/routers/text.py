@@ -7,7 +7,8 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
 
-from services.llm import LLMService
+from services.llm import get_llm_service
+from services.llm.utils import extract_tool_names
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +36,7 @@ class ProcessTextResponse(BaseModel):
 # =========================
 # Initialize LLM Service
 # =========================
-llm_service = LLMService()
+llm_service = get_llm_service()
 
 
 # =========================
@@ -63,13 +64,7 @@ async def process_text(request: TextRequest):
         )
         
         # Extract tool names (handle both string lists and dict lists)
-        tool_calls_raw = result.get('tool_calls', [])
-        tool_names = []
-        for tc in tool_calls_raw:
-            if isinstance(tc, dict):
-                tool_names.append(tc.get('name', tc.get('tool_name', 'unknown')))
-            elif isinstance(tc, str):
-                tool_names.append(tc)
+        tool_names = extract_tool_names(result.get('tool_calls', []))
         
         return ProcessTextResponse(
             response=result.get("response", ""),
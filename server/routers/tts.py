@@ -1,11 +1,12 @@
 """
 TTS Router - WebSocket endpoint for text-to-speech streaming
 """
-import json
+import orjson
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 
-from services.tts import TTSService
+from routers.ws_utils import send_json_fast
+from services.tts import get_tts_service
 
 logger = logging.getLogger(__name__)
 
@@ -14,19 +15,6 @@ logger = logging.getLogger(__name__)
 # =========================
 router = APIRouter(prefix="/tts", tags=["tts"])
 
-# =========================
-# Initialize TTS Service
-# =========================
-_tts_service = None
-
-def get_tts_service() -> TTSService:
-    """Get or create TTS service instance"""
-    global _tts_service
-    if _tts_service is None:
-        _tts_service = TTSService()
-    return _tts_service
-
-
 # =========================
 # WebSocket Endpoint
 # =========================
@@ -58,7 +46,7 @@ async def tts_websocket(websocket: WebSocket):
             
             try:
                 # Parse JSON message
-                message = json.loads(data)
+                message = orjson.loads(data)
                 
                 # Check if this is new format (with context_id) or legacy format
                 context_id = message.get("context_id")
@@ -74,21 +62,21 @@ async def tts_websocket(websocket: WebSocket):
                     
                     # Allow empty transcript for closing context
                     if transcript == "" and not continue_flag:
-                        await websocket.send_json({
+                        await send_json_fast(websocket, {
                             "status": "complete",
                             "type": "status"
                         })
                         continue
                     
                     if not transcript:
-                        await websocket.send_json({
+                        await send_json_fast(websocket, {
                             "error": "No transcript provided",
                             "type": "error"
                         })
                         continue
                     
                     # Send acknowledgment
-                    await websocket.send_json({
+                    await send_json_fast(websocket, {
                         "status": "processing",
                         "type": "status"
                     })
@@ -106,14 +94,14 @@ async def tts_websocket(websocket: WebSocket):
                             await websocket.send_bytes(audio_chunk)
                             chunk_count += 1
                     except RuntimeError as e:
-                        await websocket.send_json({
+                        await send_json_fast(websocket, {
                             "error": str(e),
                             "type": "error"
                         })
                         continue
                     
                     # Send completion message
-                    await websocket.send_json({
+                    await send_json_fast(websocket, {
                         "status": "complete",
                         "chunks": chunk_count,
                         "type": "status"
@@ -122,7 +110,7 @@ async def tts_websocket(websocket: WebSocket):
                 else:
                     # Legacy format: backward compatibility
                     if not text:
-                        await websocket.send_json({
+                        await send_json_fast(websocket, {
                             "error": "No text provided",
                             "type": "error"
                         })
@@ -132,7 +120,7 @@ async def tts_websocket(websocket: WebSocket):
                     voice_id = message.get("voice_id", None)
                     
                     # Send acknowledgment
-                    await websocket.send_json({
+                    await send_json_fast(websocket, {
                         "status": "processing",
                         "type": "status"
                     })
@@ -148,27 +136,27 @@ async def tts_websocket(websocket: WebSocket):
                             await websocket.send_bytes(audio_chunk)
                             chunk_count += 1
                     except RuntimeError as e:
-                        await websocket.send_json({
+                        await send_json_fast(websocket, {
                             "error": str(e),
                             "type": "error"
                         })
                         continue
                     
                     # Send completion message
-                    await websocket.send_json({
+                    await send_json_fast(websocket, {
                         "status": "complete",
                         "chunks": chunk_count,
                         "type": "status"
                     })
             
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Treat as plain text (legacy support)
                 text = data.strip()
                 if not text:
                     continue
                 
                 # Send acknowledgment
-                await websocket.send_json({
+                await send_json_fast(websocket, {
                     "status": "processing",
                     "type": "status"
                 })
@@ -180,14 +168,14 @@ async def tts_websocket(websocket: WebSocket):
                         await websocket.send_bytes(audio_chunk)
                         chunk_count += 1
                 except RuntimeError as e:
-                    await websocket.send_json({
+                    await send_json_fast(websocket, {
                         "error": str(e),
                         "type": "error"
                     })
                     continue
                 
                 # Send completion message
-                await websocket.send_json({
+                await send_json_fast(websocket, {
                     "status": "complete",
                     "chunks": chunk_count,
                     "type": "status"
@@ -195,7 +183,7 @@ async def tts_websocket(websocket: WebSocket):
             
             except Exception as e:
                 logger.error(f"Error processing TTS request: {e}")
-                await websocket.send_json({
+                await send_json_fast(websocket, {
                     "error": str(e),
                     "type": "error"
                 })
@@ -6,22 +6,27 @@ for real-time audio processing with STT, LLM, and TTS pipeline
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import Response
 import asyncio
-import json
-import base64
+import orjson
+import binascii
 import audioop
 import logging
 import numpy as np
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional, Tuple
+from xml.sax.saxutils import quoteattr
 
 from modules.config import ConfigEnv
-from services.stt import STTService, VADService
-from services.llm import LLMService
-from services.tts import TTSService
-from services.call_analytics import CallAnalyticsService
+from services.stt import STTService, VADService, PCMRingBuffer, RecentTranscripts
+from services.llm import get_llm_service
+from services.tts import TTSTurn, get_tts_service
+from services.tts.utils import iter_sentences
+from services.call_analytics import get_call_analytics_service
 from db.connection import get_db
 from services.user_lookup import lookup_user_by_phone, get_user_id_from_phone
 from services.greeting_audio import get_greeting_mulaw_8k_chunks
+from routers.ws_utils import cancel_and_wait, send_json_fast
 
 # =========================
 # Router Setup
@@ -36,20 +41,98 @@ TWILIO_ACCOUNT_SID = ConfigEnv.TWILIO_ACCOUNT_SID or ""
 TWILIO_AUTH_TOKEN = ConfigEnv.TWILIO_AUTH_TOKEN or ""
 TWILIO_WEBSOCKET_URL = ConfigEnv.TWILIO_WEBSOCKET_URL or "wss://your-domain.com/twilio/media"
 
+# TwiML connecting a bidirectional media stream (greeting plays over WebSocket).
+# Everything but the per-call parameters is fixed, so it is built once here
+TWIML_PREFIX = f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Connect>
+        <Stream url={quoteattr(TWILIO_WEBSOCKET_URL)}>
+'''
+TWIML_SUFFIX = '''        </Stream>
+    </Connect>
+</Response>'''
+
 # =========================
 # Constants
 # =========================
 # Twilio sends mulaw audio at 8kHz
 TWILIO_SAMPLE_RATE = 8000
 TWILIO_ENCODING = "audio/x-mulaw"
+# TTS audio goes out in media messages built from this many float32 bytes (~93ms at 44.1kHz)
+TWILIO_AUDIO_FLUSH_BYTES = 16384
+# The greeting goes out in media messages of this length instead of one per 20ms frame
+TWILIO_GREETING_CHUNK_MS = 100
+# PCM16 -> mulaw table indexed by the sample's uint16 bit pattern. Built from
+# audioop so the output is identical, but one indexed load beats lin2ulaw on
+# TTS-sized frames. (Inbound 160-byte frames stay on audioop.ulaw2lin, which is
+# faster than numpy at that size.)
+PCM16_TO_ULAW = np.frombuffer(
+    audioop.lin2ulaw(np.arange(65536, dtype=np.uint16).view(np.int16).tobytes(), 2),
+    dtype=np.uint8,
+)
 
 # Convert to 16kHz PCM16 for Soniox
 TARGET_SAMPLE_RATE = 16000
+# Cartesia TTS output rate (PCM float32)
+TTS_SAMPLE_RATE = 44100
 
 # VAD settings
-SILENCE_LIMIT_CHUNKS = 15  # ~0.5s of silence
+SILENCE_LIMIT_CHUNKS = 8  # ~0.5s of silence at 64ms per window
 VAD_MIN_SAMPLES = 512
 VAD_MIN_BYTES = VAD_MIN_SAMPLES * 2  # PCM16
+# Score two Silero frames per VAD step to halve per-step overhead
+VAD_WINDOW_SAMPLES = VAD_MIN_SAMPLES * 2
+# Inbound audio waiting to be written to Soniox (~5s of 20ms Twilio frames)
+STT_QUEUE_MAXSIZE = 256
+# VAD states; turns are finalized from the transcripts, VAD only tracks speech for barge-in
+VAD_IDLE = 0  # No speech since the last silence
+VAD_SPEAKING = 1  # Caller is talking
+# Inbound media events, which are nearly all of the traffic, start with this
+MEDIA_EVENT_PREFIX = '{"event":"media"'
+MEDIA_PAYLOAD_KEY = '"payload":"'
+
+
+# =========================
+# Audio Helpers
+# =========================
+def float32_to_pcm16(samples: np.ndarray) -> np.ndarray:
+    """Convert float32 [-1, 1] samples to PCM16, saturating instead of wrapping on overshoot."""
+    scaled = np.multiply(samples, 32767.0, dtype=np.float32)
+    np.clip(scaled, -32767.0, 32767.0, out=scaled)
+    return scaled.astype(np.int16)
+
+
+def media_message(stream_sid: str, mulaw_audio) -> str:
+    """
+    Build a Twilio media event for mulaw audio (any buffer).
+    
+    Base64 needs no JSON escaping, so only the stream SID goes through the
+    encoder and the payload is spliced in as-is.
+    """
+    payload = binascii.b2a_base64(mulaw_audio, newline=False).decode("ascii")
+    sid = orjson.dumps(stream_sid).decode()
+    return f'{{"event":"media","streamSid":{sid},"media":{{"payload":"{payload}"}}}}'
+
+
+def media_payload(message: str) -> Optional[str]:
+    """
+    Pull the base64 payload out of a Twilio media event without parsing it.
+    
+    Returns None for other events or an unexpected layout, which then go
+    through the full JSON parse.
+    """
+    if not message.startswith(MEDIA_EVENT_PREFIX):
+        return None
+    start = message.find(MEDIA_PAYLOAD_KEY)
+    if start == -1:
+        return None
+    start += len(MEDIA_PAYLOAD_KEY)
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    payload = message[start:end]
+    # Base64 never needs escaping; anything escaped is left to the parser
+    return None if "\\" in payload else payload
 
 
 # =========================
@@ -73,19 +156,13 @@ async def voice_webhook(request: Request):
     
     logger.info(f"📞 Incoming call from {from_number}, CallSid: {call_sid}")
     
-    # Use WebSocket URL from environment or default
-    ws_url = TWILIO_WEBSOCKET_URL
-    
-    # Generate TwiML to connect bidirectional media stream (greeting plays over WebSocket)
-    twiml = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Connect>
-        <Stream url="{ws_url}">
-            <Parameter name="callSid" value="{call_sid}"/>
-            <Parameter name="from" value="{from_number}"/>
-        </Stream>
-    </Connect>
-</Response>'''
+    # Only the echoed parameters change per call; they are escaped since they come from the request
+    twiml = (
+        f'{TWIML_PREFIX}'
+        f'            <Parameter name="callSid" value={quoteattr(call_sid)}/>\n'
+        f'            <Parameter name="from" value={quoteattr(from_number)}/>\n'
+        f'{TWIML_SUFFIX}'
+    )
     
     return Response(content=twiml, media_type="application/xml")
 
@@ -125,25 +202,31 @@ async def media_stream(ws: WebSocket):
     processing_lock = asyncio.Lock()  # Prevent concurrent LLM calls
     
     # Utterance accumulation state
-    current_utterance_parts = []  # Accumulate transcripts from same utterance
-    utterance_timer_task = None  # Timer to finalize utterance after pause
+    current_utterance = ""  # Final transcripts of the current utterance, space-joined as they arrive
+    recent_transcripts = RecentTranscripts()  # Drop finals re-sent for the same audio
+    utterance_timer: Optional[asyncio.TimerHandle] = None  # Finalizes the utterance after a pause
+    finalize_task: Optional[asyncio.Task] = None  # Finalization started by the timer
     UTTERANCE_TIMEOUT = 1.0  # Seconds to wait before finalizing utterance
     
+    # Inbound 8kHz -> 16kHz resampler state, carried across media frames so
+    # the interpolation doesn't restart (and click) at every 20ms boundary
+    inbound_resample_state = None
+    
+    # VAD state
+    vad_ring = PCMRingBuffer(VAD_WINDOW_SAMPLES)
+    vad_state = VAD_IDLE
+    silence_chunks = 0
+    
     # Get event loop for thread-safe task creation
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     async def send_greeting_twilio(websocket: WebSocket, sid: str) -> None:
         """Stream greeting WAV as Twilio media (mulaw 8kHz) then send mark."""
         try:
-            chunks = get_greeting_mulaw_8k_chunks()
+            chunks = get_greeting_mulaw_8k_chunks(TWILIO_GREETING_CHUNK_MS)
             for chunk in chunks:
-                payload = base64.b64encode(chunk).decode("utf-8")
-                await websocket.send_json({
-                    "event": "media",
-                    "streamSid": sid,
-                    "media": {"payload": payload},
-                })
-            await websocket.send_json({
+                await websocket.send_text(media_message(sid, chunk))
+            await send_json_fast(websocket, {
                 "event": "mark",
                 "streamSid": sid,
                 "mark": {"name": "greeting_complete"},
@@ -154,9 +237,16 @@ async def media_stream(ws: WebSocket):
     
     # Initialize services
     vad_service = VADService()
-    llm_service = LLMService()
-    tts_service = TTSService()
-    analytics_service = CallAnalyticsService()
+    # Silero runs on one pinned thread so inference doesn't stall the event loop
+    vad_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="twilio-vad")
+    # Soniox writes run on their own single thread, so they stay in order
+    # and VAD doesn't wait for the network send
+    stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="twilio-stt")
+    
+    # Shared across calls; per-call state lives in this handler
+    llm_service = get_llm_service()
+    tts_service = get_tts_service()
+    analytics_service = get_call_analytics_service()
     
     async def save_call_transcript():
         """Save complete call transcript with AI-generated insights to database."""
@@ -213,14 +303,15 @@ async def media_stream(ws: WebSocket):
     
     async def finalize_utterance():
         """Finalize accumulated utterance and trigger LLM processing"""
-        nonlocal current_utterance_parts, tts_task
+        nonlocal current_utterance, tts_task
         
-        if not current_utterance_parts:
+        if not current_utterance:
             return
         
-        # Combine all parts into one user message
-        full_text = " ".join(current_utterance_parts).strip()
-        current_utterance_parts.clear()
+        # The utterance is already one string; take it and start a new one
+        full_text = current_utterance.strip()
+        current_utterance = ""
+        recent_transcripts.clear()
         
         if not full_text:
             return
@@ -230,11 +321,7 @@ async def media_stream(ws: WebSocket):
         # Cancel any ongoing TTS if user spoke
         if tts_task and not tts_task.done():
             logger.info("🛑 Interrupting previous response - New user utterance")
-            tts_task.cancel()
-            try:
-                await tts_task
-            except asyncio.CancelledError:
-                pass
+            await cancel_and_wait(tts_task)
         
         # Add to conversation history as user message
         conversation_history.append({
@@ -245,10 +332,28 @@ async def media_stream(ws: WebSocket):
         # Trigger LLM processing
         tts_task = asyncio.create_task(process_and_respond())
     
+    def add_final_transcript(text: str, span: Optional[Tuple[int, int]]):
+        """Append a final transcript and finalize the utterance once no more arrive for UTTERANCE_TIMEOUT."""
+        nonlocal current_utterance, utterance_timer
+        
+        # Skip finals Soniox re-sent for audio already in this utterance
+        if not recent_transcripts.add(text, span):
+            return
+        current_utterance = f"{current_utterance} {text}" if current_utterance else text
+        
+        if utterance_timer:
+            utterance_timer.cancel()
+        utterance_timer = loop.call_later(UTTERANCE_TIMEOUT, on_utterance_timeout)
+    
+    def on_utterance_timeout():
+        """Start finalizing the utterance, keeping a reference so the task can't be garbage collected."""
+        nonlocal finalize_task
+        finalize_task = asyncio.create_task(finalize_utterance())
+    
     # STT service with callbacks
     def on_partial_transcript(text: str, language: str):
         """Handle streaming partial transcripts"""
-        nonlocal detected_language, current_utterance_parts
+        nonlocal detected_language
         
         # Log language changes
         if detected_language != language:
@@ -256,10 +361,10 @@ async def media_stream(ws: WebSocket):
         
         # Store detected language
         detected_language = language
-        logger.info(f"📝 Partial ({language}): {text}")
+        logger.debug("📝 Partial (%s): %s", language, text)
     
-    def on_transcript(text: str, language: str):
-        nonlocal detected_language, current_utterance_parts, utterance_timer_task
+    def on_transcript(text: str, language: str, span: Optional[Tuple[int, int]] = None):
+        nonlocal detected_language
         
         # Log language changes
         if detected_language != language:
@@ -267,26 +372,12 @@ async def media_stream(ws: WebSocket):
         
         # Store detected language
         detected_language = language
-        
-        # Accumulate transcript part
         logger.info(f"📝 Final Transcript ({language}): {text}")
-        current_utterance_parts.append(text)
-        
-        # Cancel existing timer if any
-        if utterance_timer_task and not utterance_timer_task.done():
-            utterance_timer_task.cancel()
-        
-        # Start new timer to finalize utterance after pause
-        def schedule_timer():
-            nonlocal utterance_timer_task
-            
-            async def timer():
-                await asyncio.sleep(UTTERANCE_TIMEOUT)
-                await finalize_utterance()
-            
-            utterance_timer_task = asyncio.create_task(timer())
         
-        loop.call_soon_threadsafe(schedule_timer)
+        # Accumulate and (re)start the pause timer on the event loop, so the
+        # utterance string is never touched from Soniox's thread; a TimerHandle
+        # is cheaper than a sleeping task per transcript
+        loop.call_soon_threadsafe(add_final_transcript, text, span)
     
     def on_error(error: str):
         logger.error(f"❌ STT Error: {error}")
@@ -297,9 +388,32 @@ async def media_stream(ws: WebSocket):
         on_error=on_error
     )
     
-    # Connect to Soniox
-    await asyncio.to_thread(stt_service.connect)
+    # Connect to Soniox on the same thread that later writes to and closes the connection
+    await loop.run_in_executor(stt_executor, stt_service.connect)
     logger.info("🎙️ Connected to Soniox")
+    
+    # Audio is queued and drained in batches, so a backlog costs one thread hop
+    # instead of one per 20ms frame
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=STT_QUEUE_MAXSIZE)
+    
+    async def stt_writer():
+        """Drain queued audio and stream it to Soniox in batches."""
+        # Backlogs are joined into one reused buffer; it is only touched again
+        # after the executor has finished sending it
+        batch = bytearray()
+        while True:
+            payload = await audio_queue.get()
+            if not audio_queue.empty():
+                batch[:] = payload
+                while not audio_queue.empty():
+                    batch += audio_queue.get_nowait()
+                payload = batch
+            try:
+                await loop.run_in_executor(stt_executor, stt_service.stream, payload)
+            except Exception as e:
+                logger.error("⚠️ STT streaming error: %s", e)
+    
+    stt_writer_task = asyncio.create_task(stt_writer())
 
     async def process_and_respond():
         """Process transcript with LLM and stream TTS response to Twilio"""
@@ -316,94 +430,193 @@ async def media_stream(ws: WebSocket):
             logger.info(f"📄 Processing: {full_transcript}")
             logger.info(f"📱 User ID: {user_id}, Is Twilio Call: {is_twilio_call}")
             
-            # Process with LLM - pass user_id and is_twilio_call context
-            llm_result = await llm_service.process(
+            # Process with LLM (streaming) - pass user_id and is_twilio_call context
+            llm_result = await llm_service.process_stream(
                 full_transcript, 
                 conversation_history,
                 user_id=user_id,
                 is_twilio_call=True,  # This is a Twilio phone call - no GPS available
             )
-            response_text = llm_result.get('response', '')
+            stream = llm_result.get("stream")
             
-            logger.info(f"💬 LLM Response: {response_text}")
+            # TTS audio (PCM float32 44100Hz) is gathered here and converted and sent
+            # in larger media messages instead of one per Cartesia fragment
+            audio_buffer = bytearray()
+            # Resampler state carried across flushes of this response
+            resample_state = None
             
-            # Add to conversation history
-            conversation_history.append({"role": "assistant", "text": response_text})
+            async def send_audio(audio_chunk):
+                """Buffer a TTS chunk, sending once a full media frame has built up."""
+                if not isinstance(audio_chunk, bytes):
+                    # Numpy array
+                    audio_chunk = np.asarray(audio_chunk, dtype=np.float32).tobytes()
+                audio_buffer.extend(audio_chunk)
+                if len(audio_buffer) >= TWILIO_AUDIO_FLUSH_BYTES:
+                    await flush_audio()
             
-            # Stream TTS Response back to Twilio
-            if response_text and response_text.strip() and stream_sid:
-                logger.info(f"🔊 Streaming TTS to Twilio...")
+            async def flush_audio():
+                """Convert buffered audio to Twilio media and send it."""
+                nonlocal resample_state
+                # Only whole float32 samples; a split sample waits for the next chunk
+                usable = len(audio_buffer) - len(audio_buffer) % 4
+                if not usable:
+                    return
                 
-                try:
-                    # Generate TTS audio chunks (PCM float32 44100Hz)
-                    async for audio_chunk in tts_service.stream_tts(
-                        text=response_text,
-                        language=detected_language
-                    ):
-                        if asyncio.current_task().cancelled():
-                            logger.warning("⚠️ TTS interrupted")
-                            return
-                        
-                        # Convert audio_chunk to the right format
-                        # TTS returns bytes (PCM float32 44100Hz)
-                        if isinstance(audio_chunk, bytes):
-                            # Already bytes, convert to numpy array
-                            audio_array = np.frombuffer(audio_chunk, dtype=np.float32)
-                        else:
-                            # Already numpy array
-                            audio_array = audio_chunk
-                        
-                        # Convert Float32 to PCM16
-                        audio_int16 = (audio_array * 32767).astype(np.int16)
-                        pcm_bytes = audio_int16.tobytes()
-                        
-                        # 2. Resample from 44100Hz to 8000Hz
-                        resampled, _ = audioop.ratecv(
-                            pcm_bytes, 
-                            2,  # 2 bytes per sample (int16)
-                            1,  # mono
-                            44100,  # from rate
-                            8000,  # to rate
-                            None
-                        )
-                        
-                        # 3. Convert to mulaw
-                        mulaw_audio = audioop.lin2ulaw(resampled, 2)
-                        
-                        # 4. Encode to base64
-                        payload = base64.b64encode(mulaw_audio).decode('utf-8')
-                        
-                        # 5. Send to Twilio
-                        await ws.send_json({
-                            "event": "media",
-                            "streamSid": stream_sid,
-                            "media": {
-                                "payload": payload
-                            }
-                        })
+                # Convert Float32 to PCM16. The numpy arrays are handed straight to
+                # audioop and binascii (both take any buffer), so no step copies its
+                # result into an intermediate bytes object
+                audio_array = np.frombuffer(audio_buffer, dtype=np.float32, count=usable // 4)
+                pcm16 = float32_to_pcm16(audio_array)
+                del audio_array  # Release the view so the buffer can shrink
+                del audio_buffer[:usable]
+                
+                # 2. Resample from 44100Hz to 8000Hz
+                resampled, resample_state = audioop.ratecv(
+                    pcm16, 
+                    2,  # 2 bytes per sample (int16)
+                    1,  # mono
+                    TTS_SAMPLE_RATE,  # from rate
+                    TWILIO_SAMPLE_RATE,  # to rate
+                    resample_state
+                )
+                
+                # 3. Convert to mulaw
+                mulaw_audio = PCM16_TO_ULAW[np.frombuffer(resampled, dtype=np.uint16)]
+                
+                # 4. Encode to base64 and send to Twilio
+                await ws.send_text(media_message(stream_sid, mulaw_audio))
+            
+            # Speak each sentence as soon as the LLM finishes it, so playback
+            # starts while the rest of the response is still generating
+            sentences = []
+            tts_active = bool(stream_sid) and tts_service.enabled
+            # One TTS context per turn; its language is pinned on the first sentence
+            tts_turn = TTSTurn(tts_service, detected_language if detected_language in ("hi", "en") else "auto")
+            # Reads the turn's TTS audio while the LLM is still streaming, so each
+            # sentence plays out in full instead of waiting for the next one
+            playback_task: Optional[asyncio.Task] = None
+            
+            async def play_audio():
+                """Send this turn's TTS audio to Twilio as Cartesia produces it."""
+                async for batch in tts_turn.receive():
+                    for audio_chunk in batch:
+                        await send_audio(audio_chunk)
+                    await flush_audio()
+            
+            try:
+                if stream:
+                    logger.info(f"🔊 Streaming TTS to Twilio...")
+                    async for sentence in iter_sentences(stream):
+                        sentences.append(sentence)
+                        if not tts_active:
+                            continue
+                        await tts_turn.send(sentence, True)
+                        if playback_task is None:
+                            playback_task = asyncio.create_task(play_audio())
                     
+                    if tts_active and sentences:
+                        # Empty final transcript closes the Cartesia context, in the turn's pinned language
+                        await tts_turn.send("", False)
+                        # The context is closed; wait for the rest of its audio
+                        await playback_task
+                    response_text = " ".join(sentences)
+                else:
+                    # Streaming unavailable - speak the fallback response in one go
+                    response_text = llm_result.get('response', '')
+                    if tts_active and response_text.strip():
+                        async for audio_chunk in tts_service.stream_tts(
+                            text=response_text,
+                            language=tts_turn.language
+                        ):
+                            await send_audio(audio_chunk)
+                        await flush_audio()
+                
+                if tts_active and response_text.strip():
                     # Send mark to know when playback is done
-                    await ws.send_json({
+                    await send_json_fast(ws, {
                         "event": "mark",
                         "streamSid": stream_sid,
                         "mark": {
                             "name": "end_of_response"
                         }
                     })
-                    
                     logger.info(f"✅ TTS streaming complete\n")
-                
-                except asyncio.CancelledError:
-                    logger.warning("⚠️ TTS cancelled")
-                    raise
+            
+            except asyncio.CancelledError:
+                logger.warning("⚠️ TTS cancelled")
+                # Keep what was already spoken in the history
+                if sentences:
+                    conversation_history.append({"role": "assistant", "text": " ".join(sentences)})
+                raise
+            finally:
+                await cancel_and_wait(playback_task)
+            
+            logger.info(f"💬 LLM Response: {response_text}")
+            
+            # Add to conversation history
+            conversation_history.append({"role": "assistant", "text": response_text})
 
+    # Speech detection runs in its own task, so the receive loop never waits on
+    # Silero; if VAD falls behind, the ring drops the oldest frames
+    vad_ready = asyncio.Event()
+    
+    async def vad_loop():
+        """Score buffered audio with Silero and drive the turn state."""
+        nonlocal vad_state, silence_chunks, tts_task
+        while True:
+            await vad_ready.wait()
+            vad_ready.clear()
+            while (frame := vad_ring.read_frame()) is not None:
+                # Quiet windows skip Silero and the executor hop entirely
+                if vad_service.is_quiet(frame):
+                    confidence = 0.0
+                else:
+                    try:
+                        # Copied: the receive loop keeps writing into the ring meanwhile
+                        confidence = await loop.run_in_executor(
+                            vad_executor, vad_service.get_window_confidence, frame.copy()
+                        )
+                    except Exception as e:
+                        logger.error(f"⚠️ VAD error: {e}")
+                        continue
+                
+                # Check for speech
+                if confidence > vad_service.speech_threshold:
+                    # Interrupt TTS if playing
+                    if tts_task and not tts_task.done():
+                        logger.info("🛑 Interrupting TTS")
+                        await cancel_and_wait(tts_task)
+                        tts_task = None
+                
+                    if vad_state != VAD_SPEAKING:
+                        logger.info("🎤 New speech started")
+                
+                    vad_state = VAD_SPEAKING
+                    silence_chunks = 0
+                elif vad_state == VAD_SPEAKING:
+                    silence_chunks += 1
+                
+                    # The utterance timer finalizes the turn once the transcripts stop
+                    if silence_chunks >= SILENCE_LIMIT_CHUNKS:
+                        logger.info("🔕 Silence detected")
+                        vad_state = VAD_IDLE
+                        silence_chunks = 0
+    
+    vad_task = asyncio.create_task(vad_loop())
 
     try:
         while True:
             message = await ws.receive_text()
-            data = json.loads(message)
             
-            event_type = data.get("event")
+            # Media frames skip the JSON parse; everything else is parsed in full
+            payload = media_payload(message)
+            if payload is not None:
+                event_type = "media"
+            else:
+                data = orjson.loads(message)
+                event_type = data.get("event")
+                if event_type == "media":
+                    payload = data.get("media", {}).get("payload")
             
             # Handle connection established
             if event_type == "connected":
@@ -435,77 +648,32 @@ async def media_stream(ws: WebSocket):
             
             # Handle incoming audio media
             elif event_type == "media":
-                media = data.get("media", {})
-                payload = media.get("payload")
-                
                 if payload:
-                    # Decode base64 mulaw audio
-                    mulaw_audio = base64.b64decode(payload)
+                    # Decode base64 mulaw audio (binascii directly skips b64decode's argument checks)
+                    mulaw_audio = binascii.a2b_base64(payload)
                     
                     # Convert mulaw to linear PCM16
                     pcm_audio = audioop.ulaw2lin(mulaw_audio, 2)
                     
                     # Resample from 8kHz to 16kHz for Soniox
-                    resampled, _ = audioop.ratecv(
+                    resampled, inbound_resample_state = audioop.ratecv(
                         pcm_audio,
                         2,  # 2 bytes per sample
                         1,  # mono
-                        8000,  # from rate
-                        16000,  # to rate
-                        None
+                        TWILIO_SAMPLE_RATE,  # from rate
+                        TARGET_SAMPLE_RATE,  # to rate
+                        inbound_resample_state
                     )
                     
-                    # Stream to Soniox
+                    # Stream to Soniox in the background while VAD runs
                     try:
-                        await asyncio.to_thread(stt_service.stream, resampled)
-                    except Exception as e:
-                        logger.error(f"⚠️ STT streaming error: {e}")
+                        audio_queue.put_nowait(resampled)
+                    except asyncio.QueueFull:
+                        logger.warning("[STT] Audio queue full, dropping chunk")
                     
-                    # VAD processing
-                    vad_buffer += resampled
-                    while len(vad_buffer) >= VAD_MIN_BYTES:
-                        chunk = vad_buffer[:VAD_MIN_BYTES]
-                        vad_buffer = vad_buffer[VAD_MIN_BYTES:]
-                        confidence = vad_service.get_confidence(chunk)
-                        
-                        # Check for speech
-                        if confidence > vad_service.speech_threshold:
-                            # Interrupt TTS if playing
-                            if tts_task and not tts_task.done():
-                                logger.info("🛑 Interrupting TTS")
-                                tts_task.cancel()
-                                try:
-                                    await tts_task
-                                except asyncio.CancelledError:
-                                    pass
-                                tts_task = None
-                            
-                            # Clear old transcripts on new speech
-                            if not speaking:
-                                logger.info("🎤 New speech started")
-                                transcript_buffer.clear()
-                                waiting_for_transcript = False
-                            
-                            speaking = True
-                            silence_chunks = 0
-                        else:
-                            # Silence detected
-                            if speaking:
-                                silence_chunks += 1
-                        
-                        # Process after silence threshold
-                        if speaking and silence_chunks >= SILENCE_LIMIT_CHUNKS and not processing_llm:
-                            logger.info(f"🔕 Silence detected - Waiting for transcript...")
-                            speaking = False
-                            waiting_for_transcript = True
-                            
-                            if transcript_buffer:
-                                logger.info(f"📋 Transcript ready - Processing now!")
-                                waiting_for_transcript = False
-                                tts_task = asyncio.create_task(process_and_respond())
-                            
-                            # Reset silence_chunks to prevent infinite counting
-                            silence_chunks = 0
+                    # Speech detection picks the audio up from the ring
+                    vad_ring.write(resampled)
+                    vad_ready.set()
             
             # Handle stream stop
             elif event_type == "stop":
@@ -525,14 +693,27 @@ async def media_stream(ws: WebSocket):
         logger.error(f"❌ WebSocket error: {e}", exc_info=True)
         if tts_task and not tts_task.done():
             tts_task.cancel()
-    finally:        # Save call transcript with analytics
+    finally:
+        # Stop anything that could still start or run a turn, so nothing is
+        # sent to the closed socket or added to the history after it is saved
+        if utterance_timer:
+            utterance_timer.cancel()
+        await cancel_and_wait(vad_task)
+        await cancel_and_wait(finalize_task)
+        await cancel_and_wait(tts_task)
+        
+        # Save call transcript with analytics
         await save_call_transcript()
-                # Cleanup
+        
+        # Cleanup
+        stt_writer_task.cancel()
         try:
-            await asyncio.to_thread(stt_service.disconnect)
+            await loop.run_in_executor(stt_executor, stt_service.disconnect)
             logger.info("🔌 Disconnected from Soniox")
         except Exception as e:
             logger.warning(f"⚠️ Error disconnecting: {e}")
+        stt_executor.shutdown(wait=False)
+        vad_executor.shutdown(wait=False)
 
 
 # =========================
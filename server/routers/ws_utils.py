@@ -0,0 +1,114 @@
+"""
+WebSocket helpers shared by the real-time routers
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Optional, Union
+
+import orjson
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Tags for binary frames on the web STT socket; the first byte says what the
+# frame is, and audio chunks carry raw PCM float32 44100Hz after it
+AUDIO_START = b"\x01"
+AUDIO_CHUNK = b"\x02"
+AUDIO_END = b"\x03"
+INTERRUPTED = b"\x04"
+
+# Static JSON replies, encoded once at import
+PONG = orjson.dumps({"type": "pong"}).decode()
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode date-like values orjson doesn't know natively (datetime, date and time are native)."""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def encode_fragment(obj: Any) -> orjson.Fragment:
+    """Encode obj once for embedding, unchanged, in several JSON messages."""
+    return orjson.Fragment(orjson.dumps(obj, default=_json_default))
+
+
+async def cancel_and_wait(task: Optional[asyncio.Task]) -> None:
+    """
+    Cancel a task and wait until it has finished.
+    
+    Waiting through asyncio.wait never re-raises the task's CancelledError, so
+    unlike try/await/except-CancelledError it can't swallow a cancellation
+    aimed at the caller itself.
+    """
+    if task is None or task.done():
+        return
+    task.cancel()
+    await asyncio.wait([task])
+
+
+async def send_json_fast(ws: WebSocket, obj: Any) -> None:
+    """Send obj as a JSON text frame, encoded with orjson instead of stdlib json."""
+    await ws.send_text(orjson.dumps(obj, default=_json_default).decode())
+
+
+class WebSocketWriter:
+    """
+    Single writer task for one socket's outgoing frames.
+    
+    Producers (STT callbacks, the LLM/TTS stream, the sender loop) queue frames
+    without awaiting the network, and one task writes them in order.
+    """
+    
+    def __init__(self, ws: WebSocket):
+        self.ws = ws
+        self._frames: Deque[Union[bytes, str]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+    
+    def start(self) -> None:
+        """Start the writer task on the running loop."""
+        self._task = asyncio.create_task(self._run())
+    
+    def send_bytes(self, data: bytes) -> None:
+        """Queue a binary frame."""
+        if not self.closed:
+            self._frames.append(data)
+            self._wakeup.set()
+    
+    def send_text(self, text: str) -> None:
+        """Queue a text frame."""
+        if not self.closed:
+            self._frames.append(text)
+            self._wakeup.set()
+    
+    def send_json(self, obj: Any) -> None:
+        """Queue obj as a JSON text frame, encoded with orjson."""
+        self.send_text(orjson.dumps(obj, default=_json_default).decode())
+    
+    async def _run(self) -> None:
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._frames:
+                    frame = self._frames.popleft()
+                    if isinstance(frame, bytes):
+                        await self.ws.send_bytes(frame)
+                    else:
+                        await self.ws.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The socket is gone; drop anything still queued
+            logger.warning("WebSocket writer stopped: %s", e)
+            self.closed = True
+            self._frames.clear()
+    
+    async def close(self) -> None:
+        """Stop the writer task, dropping unsent frames."""
+        self.closed = True
+        self._frames.clear()
+        await cancel_and_wait(self._task)
@@ -2,7 +2,7 @@
 Call Analytics Service - Generate summaries and satisfaction scores for call transcripts
 """
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_aws import ChatBedrockConverse
 from modules.config import ConfigEnv
@@ -112,3 +112,15 @@ Provide your analysis in JSON format."""
                 "satisfaction_score": 3,
                 "satisfaction_reasoning": f"Error during analysis: {str(e)[:50]}"
             }
+
+
+# Singleton instance
+_analytics_service: Optional[CallAnalyticsService] = None
+
+
+def get_call_analytics_service() -> CallAnalyticsService:
+    """Get or create the shared call analytics service."""
+    global _analytics_service
+    if _analytics_service is None:
+        _analytics_service = CallAnalyticsService()
+    return _analytics_service
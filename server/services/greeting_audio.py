@@ -20,6 +20,8 @@ APP_SAMPLE_RATE = 44100
 
 # (samples_float32, sample_rate) or None if load failed
 _cached: Optional[Tuple[np.ndarray, int]] = None
+# Whole greeting as mulaw 8kHz, encoded on first use
+_mulaw_cached: Optional[bytes] = None
 
 
 def _get_greeting_path() -> Path:
@@ -56,14 +58,14 @@ def _load_greeting() -> Optional[Tuple[np.ndarray, int]]:
         return None
 
 
-def get_greeting_mulaw_8k_chunks() -> List[bytes]:
-    """
-    Return greeting as 20ms mulaw 8kHz chunks for Twilio media.
-    Each chunk is 160 bytes (160 samples at 8kHz).
-    """
+def _get_greeting_mulaw_8k() -> Optional[bytes]:
+    """Resample and mulaw-encode the greeting once; every Twilio call reuses the result."""
+    global _mulaw_cached
+    if _mulaw_cached is not None:
+        return _mulaw_cached
     loaded = _load_greeting()
     if loaded is None:
-        return []
+        return None
     samples, sr = loaded
     # float32 [-1,1] -> PCM16
     pcm16 = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
@@ -74,9 +76,20 @@ def get_greeting_mulaw_8k_chunks() -> List[bytes]:
             pcm_bytes, 2, 1, sr, TWILIO_SAMPLE_RATE, None
         )
     # Convert to mulaw
-    mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
-    # Chunk: 20ms = 160 samples at 8kHz = 160 bytes
-    chunk_size = 160
+    _mulaw_cached = audioop.lin2ulaw(pcm_bytes, 2)
+    return _mulaw_cached
+
+
+def get_greeting_mulaw_8k_chunks(chunk_ms: int = TWILIO_CHUNK_MS) -> List[bytes]:
+    """
+    Return greeting as mulaw 8kHz chunks for Twilio media.
+    Each chunk is chunk_ms long; the default 20ms is 160 bytes (160 samples at 8kHz).
+    """
+    mulaw_bytes = _get_greeting_mulaw_8k()
+    if mulaw_bytes is None:
+        return []
+    # Chunk: one mulaw byte per sample, so 20ms = 160 samples at 8kHz = 160 bytes
+    chunk_size = TWILIO_SAMPLE_RATE * chunk_ms // 1000
     chunks = []
     for i in range(0, len(mulaw_bytes), chunk_size):
         chunk = mulaw_bytes[i : i + chunk_size]
@@ -1,4 +1,4 @@
 """LLM Services"""
-from .llm_service import LLMService
+from .llm_service import LLMService, get_llm_service
 
-__all__ = ["LLMService"]
+__all__ = ["LLMService", "get_llm_service"]
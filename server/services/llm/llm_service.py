@@ -3,6 +3,7 @@ LLM Service - Language Model Processing
 Handles LLM interactions for processing transcripts using the response pipeline
 """
 import logging
+from typing import Optional
 
 from modules.config import ConfigEnv
 from modules.response.response import ResponsePipeline
@@ -125,3 +126,15 @@ class LLMService:
                 "tool_results": [],
                 "error": str(e)
             }
+
+
+# Singleton instance
+_llm_service: Optional[LLMService] = None
+
+
+def get_llm_service() -> LLMService:
+    """Get or create the shared LLM service; it holds no per-call state."""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
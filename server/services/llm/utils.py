@@ -0,0 +1,21 @@
+"""
+LLM utility functions for working with pipeline results.
+"""
+from typing import Any, List
+
+
+def extract_tool_names(tool_calls: List[Any]) -> List[str]:
+    """
+    Get tool names from pipeline tool calls.
+    
+    Args:
+        tool_calls: Tool calls as names or dicts with "name"/"tool_name"
+        
+    Returns:
+        Tool names in call order; entries of any other type are skipped
+    """
+    return [
+        tc if isinstance(tc, str) else tc.get("name", tc.get("tool_name", "unknown"))
+        for tc in tool_calls
+        if isinstance(tc, (str, dict))
+    ]
@@ -1,5 +1,6 @@
 """STT Services"""
 from .soniox_service import STTService
-from .vad_service import VADService
+from .vad_service import VADService, PCMRingBuffer
+from .transcript_filter import RecentTranscripts
 
-__all__ = ["STTService", "VADService"]
+__all__ = ["STTService", "VADService", "PCMRingBuffer", "RecentTranscripts"]
@@ -12,9 +12,12 @@ from assemblyai.streaming.v3 import (
     StreamingError,
 )
 from typing import Type, Callable, Optional
+import logging
 
 from modules.config import ConfigEnv
 
+logger = logging.getLogger(__name__)
+
 # =========================
 # Configuration
 # =========================
@@ -107,7 +110,7 @@ class STTService:
                 self.client.stream(chunk)
         except Exception as e:
             # Handle connection errors gracefully (keepalive timeout, etc.)
-            print(f"⚠️  AssemblyAI streaming error: {e}")
+            logger.warning("⚠️  AssemblyAI streaming error: %s", e)
             # Don't re-raise, allow processing to continue
     
     def disconnect(self):
@@ -122,6 +125,6 @@ class STTService:
                 self.client.disconnect(terminate=True)
             except Exception as e:
                 # Handle keepalive timeout and other disconnect errors gracefully
-                print(f"⚠️  AssemblyAI disconnect error (expected on timeout): {e}")
+                logger.warning("⚠️  AssemblyAI disconnect error (expected on timeout): %s", e)
             finally:
                 self.client = None
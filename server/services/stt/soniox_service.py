@@ -4,7 +4,7 @@ Handles continuous audio streaming to Soniox WebSocket API
 """
 import json
 import asyncio
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple, Union
 from websockets.sync.client import connect, ClientConnection
 import threading
 import logging
@@ -29,7 +29,9 @@ class STTService:
     
     def __init__(
         self,
-        on_transcript: Optional[Callable[[str, str], None]] = None,
+        # Called with (text, language, span); span is the (start_ms, end_ms) of the
+        # audio the final tokens cover, or None if Soniox sent no timing
+        on_transcript: Optional[Callable[[str, str, Optional[Tuple[int, int]]], None]] = None,
         on_partial_transcript: Optional[Callable[[str, str], None]] = None,
         on_error: Optional[Callable[[str], None]] = None
     ):
@@ -100,6 +102,8 @@ class STTService:
                         # Separate final and non-final tokens
                         final_text = ""
                         partial_text = ""
+                        final_start_ms = None
+                        final_end_ms = None
                         
                         # Count language occurrences in this batch
                         batch_languages = {"en": 0, "hi": 0}
@@ -114,6 +118,9 @@ class STTService:
                             
                             if token.get("is_final"):
                                 final_text += text
+                                if final_start_ms is None:
+                                    final_start_ms = token.get("start_ms")
+                                final_end_ms = token.get("end_ms", final_end_ms)
                             else:
                                 partial_text += text
                         
@@ -149,7 +156,10 @@ class STTService:
                         
                         # Send final transcripts with stable language
                         if final_text and self.on_transcript_callback:
-                            self.on_transcript_callback(final_text.strip(), detected_language)
+                            span = None
+                            if final_start_ms is not None and final_end_ms is not None:
+                                span = (final_start_ms, final_end_ms)
+                            self.on_transcript_callback(final_text.strip(), detected_language, span)
                     
                     # Check if session finished
                     if response.get("finished"):
@@ -168,8 +178,8 @@ class STTService:
             if self.on_error_callback:
                 self.on_error_callback(str(e))
     
-    def stream(self, audio_bytes: bytes):
-        """Stream audio chunk to Soniox"""
+    def stream(self, audio_bytes: Union[bytes, bytearray, memoryview]):
+        """Stream audio chunk (any bytes-like buffer) to Soniox"""
         if not self.ws or not self.running:
             return
         
@@ -177,7 +187,7 @@ class STTService:
             # Send raw audio bytes
             self.ws.send(audio_bytes)
         except Exception as e:
-            logger.error(f"Error streaming audio: {e}")
+            logger.error("Error streaming audio: %s", e)
             if self.on_error_callback:
                 self.on_error_callback(str(e))
     
@@ -0,0 +1,44 @@
+"""
+Transcript Filter - drops final transcripts that Soniox re-sent for the same audio
+"""
+from collections import deque
+from typing import Deque, Hashable, Optional, Set, Tuple
+
+# How many recent transcripts to remember
+RECENT_TRANSCRIPT_LIMIT = 8
+
+
+def _normalize(text: str) -> str:
+    """Normalize text so punctuation and case changes count as repeats"""
+    return text.rstrip(".!?। ").lower()
+
+
+class RecentTranscripts:
+    """
+    Remembers the last few transcripts with O(1) membership checks.
+    
+    Transcripts are keyed on the audio span their tokens cover, so a caller who
+    really says "yes" twice keeps both, while a final re-sent for the same audio
+    is dropped. Text is only compared when there is no timing.
+    """
+    
+    def __init__(self, maxlen: int = RECENT_TRANSCRIPT_LIMIT):
+        self._order: Deque[Hashable] = deque()
+        self._seen: Set[Hashable] = set()
+        self.maxlen = maxlen
+    
+    def add(self, text: str, span: Optional[Tuple[int, int]] = None) -> bool:
+        """Record a transcript and its (start_ms, end_ms) span; return False if it repeats a recent one"""
+        key: Hashable = span if span is not None else hash(_normalize(text))
+        if key in self._seen:
+            return False
+        if len(self._order) >= self.maxlen:
+            self._seen.discard(self._order.popleft())
+        self._order.append(key)
+        self._seen.add(key)
+        return True
+    
+    def clear(self) -> None:
+        """Forget everything, e.g. when a new utterance starts"""
+        self._order.clear()
+        self._seen.clear()
@@ -2,6 +2,9 @@
 VAD Service - Silero VAD Integration
 Handles voice activity detection for silence detection
 """
+import copy
+from typing import Optional, Union
+
 import numpy as np
 import torch
 from silero_vad import load_silero_vad
@@ -13,6 +16,35 @@ torch.set_num_threads(1)
 # =========================
 SAMPLE_RATE = 16000
 SPEECH_THRESHOLD = 0.6
+# Silero only accepts exactly 512 samples per call at 16kHz
+MODEL_WINDOW_SAMPLES = 512
+INT16_TO_FLOAT = np.float32(1 / 32768)
+# Any buffer-protocol PCM16 source; read through np.frombuffer without copying
+PCMBuffer = Union[bytes, bytearray, memoryview]
+# PCM16 RMS below this is treated as silence without running the model
+ENERGY_GATE_RMS = 200.0
+
+
+# =========================
+# Shared Model
+# =========================
+_base_model = None
+
+def get_base_model():
+    """
+    Load Silero once per process and warm it up with a silent frame.
+    
+    Each VADService deep-copies this model, which is far cheaper than a fresh
+    load and keeps the recurrent state separate for every call.
+    """
+    global _base_model
+    if _base_model is None:
+        model = load_silero_vad()
+        with torch.inference_mode():
+            model(torch.zeros(MODEL_WINDOW_SAMPLES), SAMPLE_RATE)
+        model.reset_states()
+        _base_model = model
+    return _base_model
 
 
 # =========================
@@ -21,27 +53,102 @@ SPEECH_THRESHOLD = 0.6
 class VADService:
     """Voice Activity Detection using Silero VAD"""
     
-    def __init__(self, speech_threshold: float = SPEECH_THRESHOLD):
-        self.model = load_silero_vad()
+    def __init__(self, speech_threshold: float = SPEECH_THRESHOLD, energy_gate: float = ENERGY_GATE_RMS):
+        self.model = copy.deepcopy(get_base_model())
         self.speech_threshold = speech_threshold
+        self.energy_gate = energy_gate
     
     def int2float(self, sound: np.ndarray) -> np.ndarray:
         """Convert PCM16 to Float32"""
-        abs_max = np.abs(sound).max()
-        sound = sound.astype("float32")
-        if abs_max > 0:
-            sound *= 1 / 32768
-        return sound.squeeze()
-    
-    def get_confidence(self, audio_bytes: bytes) -> float:
-        """Get VAD confidence for audio chunk"""
-        audio_int16 = np.frombuffer(audio_bytes, np.int16)
+        # One pass, one allocation; silence stays all zeros without a max() scan
+        return np.multiply(sound, INT16_TO_FLOAT, dtype=np.float32).squeeze()
+    
+    def get_confidence(self, audio_bytes: PCMBuffer) -> float:
+        """Get VAD confidence for audio chunk (bytes or a memoryview slice)"""
+        return self.get_confidence_np(np.frombuffer(audio_bytes, np.int16))
+    
+    def get_confidence_np(self, audio_int16: np.ndarray) -> float:
+        """Get VAD confidence for a PCM16 sample array"""
         audio_float32 = self.int2float(audio_int16)
         audio_tensor = torch.from_numpy(audio_float32)
         
         confidence = self.model(audio_tensor, SAMPLE_RATE).item()
         return confidence
     
-    def is_speech(self, audio_bytes: bytes) -> bool:
+    def is_quiet(self, audio_int16: np.ndarray) -> bool:
+        """Check whether a PCM16 window is too quiet to be worth scoring"""
+        if not len(audio_int16):
+            return True
+        samples = audio_int16.astype(np.float32)
+        mean_square = np.dot(samples, samples) / len(samples)
+        return mean_square < self.energy_gate * self.energy_gate
+    
+    def get_window_confidence(self, audio_int16: np.ndarray) -> float:
+        """
+        Get the peak VAD confidence over a window of several model frames.
+        
+        The PCM16 to float conversion runs once for the whole window and all
+        model calls share one inference-mode block. Trailing samples short of
+        a full model frame are ignored.
+        """
+        audio_tensor = torch.from_numpy(self.int2float(audio_int16))
+        confidence = 0.0
+        with torch.inference_mode():
+            for start in range(0, len(audio_tensor) - MODEL_WINDOW_SAMPLES + 1, MODEL_WINDOW_SAMPLES):
+                frame = audio_tensor[start:start + MODEL_WINDOW_SAMPLES]
+                confidence = max(confidence, self.model(frame, SAMPLE_RATE).item())
+        return confidence
+    
+    def is_speech(self, audio_bytes: PCMBuffer) -> bool:
         """Check if audio chunk contains speech"""
         return self.get_confidence(audio_bytes) > self.speech_threshold
+
+
+# =========================
+# PCM Ring Buffer
+# =========================
+class PCMRingBuffer:
+    """
+    Fixed-size PCM16 ring buffer that yields VAD frames without copying.
+    
+    Capacity is a whole number of frames and reads always advance by one
+    frame, so a frame never wraps and can be returned as a view.
+    """
+    
+    def __init__(self, frame_samples: int, capacity_frames: int = 8):
+        self.frame_samples = frame_samples
+        self._buf = np.zeros(frame_samples * capacity_frames, dtype=np.int16)
+        self._read = 0
+        self._write = 0
+        self.available = 0
+    
+    def write(self, pcm_bytes: PCMBuffer) -> None:
+        """Append PCM16 audio, dropping the oldest whole frames on overflow"""
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        capacity = len(self._buf)
+        n = len(samples)
+        if n > capacity:
+            samples = samples[n - capacity:]
+            n = capacity
+        
+        overflow = self.available + n - capacity
+        if overflow > 0:
+            dropped = -(-overflow // self.frame_samples) * self.frame_samples
+            self._read = (self._read + dropped) % capacity
+            self.available -= dropped
+        
+        first = min(n, capacity - self._write)
+        self._buf[self._write:self._write + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+        self._write = (self._write + n) % capacity
+        self.available += n
+    
+    def read_frame(self) -> Optional[np.ndarray]:
+        """Return the next full frame as a view, or None if not enough audio"""
+        if self.available < self.frame_samples:
+            return None
+        start = self._read
+        self._read = (start + self.frame_samples) % len(self._buf)
+        self.available -= self.frame_samples
+        return self._buf[start:start + self.frame_samples]
@@ -1,4 +1,4 @@
 """TTS Services"""
-from .tts_service import TTSService
+from .tts_service import TTSService, TTSTurn, get_tts_service
 
-__all__ = ["TTSService"]
+__all__ = ["TTSService", "TTSTurn", "get_tts_service"]
@@ -2,7 +2,8 @@
 TTS Service - Business logic for text-to-speech generation using Cartesia.
 """
 import asyncio
-from typing import AsyncGenerator, Literal, Optional, Any, Dict
+import secrets
+from typing import AsyncGenerator, List, Literal, Optional, Any, Dict
 
 from cartesia import AsyncCartesia
 from cartesia.tts import OutputFormat_RawParams
@@ -137,17 +138,17 @@ class TTSService:
             ):
                 yield audio_chunk
     
-    async def stream_tts_chunk(
+    async def send_tts_chunk(
         self,
         transcript: str,
         context_id: str,
         continue_flag: bool,
         language: Optional[Literal["hi", "en", "auto"]] = "auto",
         voice_id: Optional[str] = None,
-    ) -> AsyncGenerator[bytes, None]:
+    ) -> None:
         """
-        Stream a single transcript chunk on a context.
-        Maintains WebSocket connection across chunks with same context_id.
+        Send a transcript chunk on a context without reading its audio.
+        Opens the context's WebSocket on the first chunk and reuses it after.
         
         Args:
             transcript: Text chunk to convert to speech
@@ -155,9 +156,6 @@ class TTSService:
             continue_flag: True if more chunks will follow, False for final chunk
             language: Language code ("hi", "en", or "auto" for auto-detect)
             voice_id: Optional voice ID (uses default if not provided)
-            
-        Yields:
-            Audio chunks as bytes (PCM float32 little-endian format)
         """
         if not self.ensure_enabled():
             return
@@ -240,7 +238,94 @@ class TTSService:
                 continue_=continue_flag,  # SDK uses continue_ (with underscore)
                 stream=True,
             )
+        except Exception:
+            await self._close_context(context_id)
+            raise
+    
+    async def receive_tts_chunks(self, context_id: str) -> AsyncGenerator[List[bytes], None]:
+        """
+        Read a context's audio until Cartesia marks it done.
+        
+        Meant to run alongside send_tts_chunk, so audio is drained as it is
+        generated rather than only when the next text is sent. Each batch holds
+        the chunks already queued, so callers can coalesce a burst and still
+        flush as soon as it ends.
+        
+        Yields:
+            Lists of audio chunks as bytes (PCM float32 little-endian format)
+        """
+        context_data = self.active_contexts.get(context_id)
+        if context_data is None:
+            return
+        ws = context_data["ws"]
+        done = False
+        try:
+            while not done:
+                response = await ws._get_message(context_id, timeout=ws.timeout, flush_id=-1)
+                batch: List[bytes] = []
+                while True:
+                    response_obj = parse_obj_as(WebSocketResponse, response)
+                    if isinstance(response_obj, WebSocketResponse_Error):
+                        raise RuntimeError(f"Error generating audio:\n{response_obj.error}")
+                    if isinstance(response_obj, WebSocketResponse_Done):
+                        done = True
+                        break
+                    output = ws._convert_response(response_obj, include_context_id=True)
+                    if output.audio is not None:
+                        batch.append(output.audio)
+                    queue = ws._context_queues[context_id][-1]
+                    if queue.empty():
+                        break
+                    response = queue.get_nowait()
+                if batch:
+                    yield batch
+        except asyncio.TimeoutError:
+            raise RuntimeError("Timeout waiting for audio chunk")
+        finally:
+            if done:
+                ws._remove_context(context_id)
+                self.active_contexts.pop(context_id, None)
+            else:
+                # Interrupted or failed mid-response; nothing will read this context again
+                await self._close_context(context_id)
+    
+    async def _close_context(self, context_id: str) -> None:
+        context_data = self.active_contexts.pop(context_id, None)
+        if context_data is not None:
+            try:
+                await context_data["ws"].close()
+            except:
+                pass
+    
+    async def stream_tts_chunk(
+        self,
+        transcript: str,
+        context_id: str,
+        continue_flag: bool,
+        language: Optional[Literal["hi", "en", "auto"]] = "auto",
+        voice_id: Optional[str] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Stream a single transcript chunk on a context.
+        Maintains WebSocket connection across chunks with same context_id.
+        
+        Args:
+            transcript: Text chunk to convert to speech
+            context_id: Unique identifier for the streaming context
+            continue_flag: True if more chunks will follow, False for final chunk
+            language: Language code ("hi", "en", or "auto" for auto-detect)
+            voice_id: Optional voice ID (uses default if not provided)
             
+        Yields:
+            Audio chunks as bytes (PCM float32 little-endian format)
+        """
+        if not self.ensure_enabled():
+            return
+        await self.send_tts_chunk(transcript, context_id, continue_flag, language=language, voice_id=voice_id)
+        ws = self.active_contexts[context_id]["ws"]
+        ctx = self.active_contexts[context_id]["ctx"]
+        
+        try:
             # For intermediate chunks (continue_=True), we need to get audio without waiting for done
             # For final chunks (continue_=False), receive() will get done and close context
             # The issue: receive() waits for done message, which won't come for intermediate chunks
@@ -327,12 +412,7 @@ class TTSService:
         
         except Exception as e:
             # On error, clean up context
-            if context_id in self.active_contexts:
-                try:
-                    await self.active_contexts[context_id]["ws"].close()
-                except:
-                    pass
-                del self.active_contexts[context_id]
+            await self._close_context(context_id)
             raise
     
     async def close(self):
@@ -349,6 +429,39 @@ class TTSService:
         await self.client.close()
 
 
+class TTSTurn:
+    """
+    One response's streaming TTS context.
+    
+    A context keeps the voice it was opened with, so the language is pinned
+    on the first chunk: "auto" is detected from that chunk's text and reused
+    for every later one, including the empty chunk that closes the context.
+    
+    Text goes in through send() and audio comes out of receive(), which the
+    caller runs as its own task so playback never waits for the next sentence.
+    """
+
+    def __init__(self, service: TTSService, language: Literal["hi", "en", "auto"] = "auto"):
+        self.service = service
+        self.context_id = f"tts-{secrets.token_hex(8)}"
+        self.language = language
+
+    async def send(self, transcript: str, continue_flag: bool) -> None:
+        """Send one text chunk on this turn's context (see TTSService.send_tts_chunk)."""
+        if self.language == "auto":
+            self.language = utils.detect_language(transcript)
+        await self.service.send_tts_chunk(
+            transcript=transcript,
+            context_id=self.context_id,
+            continue_flag=continue_flag,
+            language=self.language,
+        )
+
+    def receive(self) -> AsyncGenerator[List[bytes], None]:
+        """Audio for this turn in batches, until the context is done (see TTSService.receive_tts_chunks)."""
+        return self.service.receive_tts_chunks(self.context_id)
+
+
 # Singleton instance
 _tts_service: Optional[TTSService] = None
 
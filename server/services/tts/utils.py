@@ -2,7 +2,10 @@
 TTS utility functions for language detection and voice management.
 """
 import re
-from typing import Literal
+from typing import AsyncGenerator, AsyncIterator, Literal
+
+# Sentence ends at . ! ? or the Devanagari danda, followed by whitespace
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?\u0964])\s+')
 
 
 def detect_language(text: str) -> Literal["hi", "en"]:
@@ -96,3 +99,49 @@ def split_mixed_text(text: str) -> list[tuple[str, Literal["hi", "en"]]]:
         segments.append((current_segment, current_lang))
     
     return segments if segments else [("", "en")]
+
+
+def split_complete_sentences(text: str, min_chars: int = 10) -> tuple[str, str]:
+    """
+    Split buffered text into its complete sentences and the unfinished rest.
+    
+    Args:
+        text: Buffered LLM text
+        min_chars: Shortest complete part worth sending on its own
+        
+    Returns:
+        (complete, remainder); complete is "" until a sentence of at least
+        min_chars has ended
+    """
+    end = None
+    for end in SENTENCE_END_PATTERN.finditer(text):
+        pass
+    if end is None or len(text[:end.start()].strip()) < min_chars:
+        return "", text
+    return text[:end.end()], text[end.end():]
+
+
+async def iter_sentences(text_stream: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+    """
+    Regroup a streamed LLM response into whole sentences.
+    
+    Each sentence is yielded as soon as its boundary arrives, so TTS can
+    start on it while the rest of the response is still generating.
+    
+    Args:
+        text_stream: Async iterator of text chunks
+        
+    Yields:
+        Sentences with surrounding whitespace stripped
+    """
+    buffer = ""
+    async for chunk in text_stream:
+        buffer += chunk
+        parts = SENTENCE_END_PATTERN.split(buffer)
+        buffer = parts.pop()
+        for sentence in parts:
+            if sentence.strip():
+                yield sentence.strip()
+    
+    if buffer.strip():
+        yield buffer.strip()
@@ -0,0 +1,113 @@
+"""Tests for the agent handoff manager."""
+
+import json
+import struct
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from routers.agent import HandoffManager, upsample_audio
+
+
+def make_ws():
+    """Create a mock WebSocket with async send methods."""
+    ws = AsyncMock()
+    ws.send_text = AsyncMock()
+    ws.send_json = AsyncMock()
+    ws.send_bytes = AsyncMock()
+    return ws
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_all_agents_despite_failure():
+    """Test a failing agent connection does not stop the broadcast."""
+    manager = HandoffManager()
+    good_ws = make_ws()
+    bad_ws = make_ws()
+    bad_ws.send_text.side_effect = RuntimeError("connection closed")
+    manager.available_agents = {"good": good_ws, "bad": bad_ws}
+
+    await manager._broadcast_to_agents({"type": "call_cancelled", "session_id": "s1"})
+
+    good_ws.send_text.assert_awaited_once()
+    payload = json.loads(good_ws.send_text.await_args.args[0])
+    assert payload == {"type": "call_cancelled", "session_id": "s1"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_skips_excluded_agent():
+    """Test the excluded agent does not receive the broadcast."""
+    manager = HandoffManager()
+    a_ws = make_ws()
+    b_ws = make_ws()
+    manager.available_agents = {"a": a_ws, "b": b_ws}
+
+    await manager._broadcast_to_agents({"type": "call_accepted_by_other"}, exclude_agent="a")
+
+    a_ws.send_text.assert_not_awaited()
+    b_ws.send_text.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_queue_snapshot_invalidated_on_new_handoff():
+    """Test registering agents see handoffs queued after the last snapshot."""
+    manager = HandoffManager()
+    first_ws = make_ws()
+    await manager.register_agent("a", first_ws)
+    first = json.loads(first_ws.send_text.await_args.args[0])
+    assert first["total_pending"] == 0
+
+    await manager.request_handoff("user-1", make_ws(), "battery issue", [])
+
+    second_ws = make_ws()
+    await manager.register_agent("b", second_ws)
+    second = json.loads(second_ws.send_text.await_args.args[0])
+    assert second["type"] == "queue_status"
+    assert second["total_pending"] == 1
+    assert second["pending_calls"][0]["user_id"] == "user-1"
+
+
+def test_upsample_audio_interpolates_linearly():
+    """Test upsampling doubles the sample count and interpolates between samples."""
+    audio = struct.pack("<3f", 0.0, 1.0, 0.5)
+
+    result = upsample_audio(audio, 8000, 16000)
+
+    samples = struct.unpack("<6f", result)
+    assert samples == pytest.approx([0.0, 0.5, 1.0, 0.75, 0.5, 0.5])
+
+
+@pytest.mark.asyncio
+async def test_agent_connection_callback_fires_on_accept_and_end():
+    """Test the user side is told when an agent joins and when the call ends."""
+    manager = HandoffManager()
+    events = []
+    session_id = await manager.request_handoff("user-1", make_ws(), "battery issue", [])
+    manager.set_agent_connection_callback(session_id, events.append)
+
+    await manager.accept_call("agent-1", make_ws(), session_id)
+    await manager.end_call(session_id, ended_by="agent")
+
+    assert events == [True, False]
+    assert session_id not in manager.agent_connection_callbacks
+
+
+@pytest.mark.asyncio
+async def test_user_frames_go_through_registered_writer():
+    """Test frames for the user are queued on the call's writer, not sent on the socket."""
+    manager = HandoffManager()
+    user_ws = make_ws()
+    user_writer = MagicMock()
+    session_id = await manager.request_handoff(
+        "user-1", user_ws, "battery issue", [], user_writer=user_writer
+    )
+
+    await manager.accept_call("agent-1", make_ws(), session_id)
+    await manager.relay_message_to_user(session_id, {"type": "agent_message", "text": "hi"})
+    await manager.relay_audio_to_user(session_id, struct.pack("<2h", 0, 1000))
+
+    user_ws.send_text.assert_not_awaited()
+    user_ws.send_bytes.assert_not_awaited()
+    sent_types = [c.args[0]["type"] for c in user_writer.send_json.call_args_list]
+    assert sent_types == ["agent_connected", "agent_message"]
+    user_writer.send_bytes.assert_called_once()
@@ -0,0 +1,36 @@
+"""Tests for call transcript pagination cursors."""
+
+from datetime import datetime
+
+from bson import ObjectId
+
+from routers.call_transcripts import _after_cursor, _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes back to the page's last start_time and _id."""
+    start_time = datetime(2026, 1, 2, 3, 4, 5)
+    doc_id = ObjectId()
+
+    cursor = _encode_cursor({"start_time": start_time, "_id": str(doc_id)})
+
+    assert _decode_cursor(cursor) == (start_time, doc_id)
+
+
+def test_cursor_for_document_without_start_time():
+    """Test a page ending on a document without start_time still gets a cursor."""
+    doc_id = ObjectId()
+
+    cursor = _encode_cursor({"_id": str(doc_id)})
+
+    assert _decode_cursor(cursor) == (None, doc_id)
+    assert _after_cursor(None, doc_id) == {"start_time": None, "_id": {"$lt": doc_id}}
+
+
+def test_after_cursor_keeps_documents_without_start_time():
+    """Test documents without start_time, which sort last, are reachable from later pages."""
+    doc_id = ObjectId()
+
+    query = _after_cursor(datetime(2026, 1, 2), doc_id)
+
+    assert {"start_time": None} in query["$or"]
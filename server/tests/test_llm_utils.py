@@ -0,0 +1,21 @@
+"""Tests for LLM result helpers."""
+
+from services.llm.utils import extract_tool_names
+
+
+def test_extract_tool_names_handles_mixed_entries():
+    """Test names come from strings and dict keys, other entries are skipped."""
+    tool_calls = [
+        "getUserInfo",
+        {"name": "findNearestStation"},
+        {"tool_name": "requestHumanAgent"},
+        {"args": {}},
+        None,
+    ]
+
+    assert extract_tool_names(tool_calls) == [
+        "getUserInfo",
+        "findNearestStation",
+        "requestHumanAgent",
+        "unknown",
+    ]
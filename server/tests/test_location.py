@@ -0,0 +1,108 @@
+"""Tests for location route helpers."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import jwt
+import pytest
+
+from modules.config import ConfigEnv
+from routers import location
+
+TEST_SECRET = "test-secret-key-for-location-routes"
+
+
+def make_token(sub: str, exp_offset: int) -> str:
+    """Create an HS256 token for the configured secret."""
+    now = int(time.time())
+    return jwt.encode({"sub": sub, "iat": now, "exp": now + exp_offset}, ConfigEnv.AUTH_JWT_SECRET, algorithm="HS256")
+
+
+def test_get_user_id_from_token_valid(monkeypatch):
+    """Test a valid bearer token resolves to its subject."""
+    monkeypatch.setattr(ConfigEnv, "AUTH_JWT_SECRET", TEST_SECRET)
+    token = make_token("user-1", 3600)
+
+    assert location.get_user_id_from_token(f"Bearer {token}") == "user-1"
+    # Second lookup is served from the cache
+    assert location.get_user_id_from_token(f"Bearer {token}") == "user-1"
+
+
+def test_get_user_id_from_token_rechecks_expiry(monkeypatch):
+    """Test a cached token is rejected once it has expired."""
+    monkeypatch.setattr(ConfigEnv, "AUTH_JWT_SECRET", TEST_SECRET)
+    token = make_token("user-2", 60)
+    assert location.get_user_id_from_token(token) == "user-2"
+
+    real_time = time.time
+    monkeypatch.setattr(location.time, "time", lambda: real_time() + 120)
+
+    assert location.get_user_id_from_token(token) is None
+
+
+def test_get_user_id_from_token_invalid(monkeypatch):
+    """Test malformed or missing tokens resolve to None."""
+    monkeypatch.setattr(ConfigEnv, "AUTH_JWT_SECRET", TEST_SECRET)
+
+    assert location.get_user_id_from_token(None) is None
+    assert location.get_user_id_from_token("Bearer not-a-jwt") is None
+
+
+@pytest.mark.asyncio
+async def test_reverse_geocode_caches_and_shares_lookups(monkeypatch):
+    """Test nearby coordinates hit the cache and concurrent lookups share one request."""
+    monkeypatch.setattr(ConfigEnv, "GEOCODING_API_KEY", "geo-key")
+    monkeypatch.setattr(location, "_geo_cache", OrderedDict())
+    calls = []
+
+    async def fake_fetch(latitude, longitude, api_key):
+        calls.append((latitude, longitude))
+        await asyncio.sleep(0)
+        return "12 Main Road"
+
+    monkeypatch.setattr(location, "_fetch_address", fake_fetch)
+
+    results = await asyncio.gather(
+        location.reverse_geocode(12.97161, 77.59461),
+        location.reverse_geocode(12.97161, 77.59461),
+    )
+    assert results == ["12 Main Road", "12 Main Road"]
+    # Within the rounding precision, served from cache
+    assert await location.reverse_geocode(12.97159, 77.59459) == "12 Main Road"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_geocode_and_patch_only_updates_matching_location(monkeypatch):
+    """Test the background patch is conditioned on the saved timestamp."""
+    async def fake_geocode(latitude, longitude):
+        return "12 Main Road"
+
+    db = MagicMock()
+    db.users.update_one = AsyncMock()
+    monkeypatch.setattr(location, "reverse_geocode", fake_geocode)
+    monkeypatch.setattr(location, "get_db", lambda: db)
+    saved_at = datetime(2026, 1, 1, 12, 0, 0)
+
+    await location._geocode_and_patch("user-1", 12.97, 77.59, saved_at)
+
+    db.users.update_one.assert_awaited_once_with(
+        {"user_id": "user-1", "location.updated_at": saved_at},
+        {"$set": {"location.address": "12 Main Road"}},
+    )
+
+
+def test_get_user_id_from_token_honours_nbf(monkeypatch):
+    """Test PyJWT's claim checks apply, so a not-yet-valid token is rejected."""
+    monkeypatch.setattr(ConfigEnv, "AUTH_JWT_SECRET", TEST_SECRET)
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": "user-3", "nbf": now + 600, "exp": now + 3600},
+        ConfigEnv.AUTH_JWT_SECRET,
+        algorithm="HS256",
+    )
+
+    assert location.get_user_id_from_token(token) is None
@@ -19,6 +19,12 @@ OUTPUT_SAMPLE_RATE = 44100  # TTS output
 CHANNELS = 1
 CHUNK_SIZE = 512  # Silero VAD requires exactly 512 samples for 16kHz (32ms chunks)
 
+# Binary frame tags sent by the server (first byte of each binary frame)
+FRAME_AUDIO_START = b"\x01"
+FRAME_AUDIO_CHUNK = b"\x02"
+FRAME_AUDIO_END = b"\x03"
+FRAME_INTERRUPTED = b"\x04"
+
 # =========================
 # Audio Stream Handler
 # =========================
@@ -38,13 +44,39 @@ class AudioStreamer:
             while self.running:
                 message = await self.websocket.recv()
                 
-                # Check if it's JSON or raw audio bytes
+                # Binary frames are tagged by their first byte; JSON is metadata
                 if isinstance(message, bytes):
-                    # Raw audio bytes from TTS
-                    if self.playing_audio:
-                        # Convert bytes to float32 numpy array
-                        audio_data = np.frombuffer(message, dtype=np.float32)
-                        self.audio_playback_queue.put(audio_data)
+                    tag = message[:1]
+                    if tag == FRAME_AUDIO_CHUNK:
+                        # Raw audio bytes from TTS
+                        if self.playing_audio:
+                            # Convert bytes to float32 numpy array
+                            audio_data = np.frombuffer(message, dtype=np.float32, offset=1)
+                            self.audio_playback_queue.put(audio_data)
+                    
+                    elif tag == FRAME_AUDIO_START:
+                        print("\n🔊 Receiving TTS audio...", flush=True)
+                        self.playing_audio = True
+                        # Start audio playback in separate thread
+                        threading.Thread(target=self._play_audio, daemon=True).start()
+                    
+                    elif tag == FRAME_AUDIO_END:
+                        print("✅ TTS audio complete\n")
+                        # Signal end of audio
+                        self.audio_playback_queue.put(None)
+                        self.playing_audio = False
+                    
+                    elif tag == FRAME_INTERRUPTED:
+                        print("⚠️  TTS interrupted - New speech detected\n")
+                        # Signal audio playback thread to stop immediately
+                        self.stop_playback.set()
+                        # Clear playback queue
+                        while not self.audio_playback_queue.empty():
+                            try:
+                                self.audio_playback_queue.get_nowait()
+                            except:
+                                break
+                        self.playing_audio = False
                 else:
                     # JSON message
                     try:
@@ -61,30 +93,6 @@ class AudioStreamer:
                             
                             print(f"\n🤖 RESPONSE:\n{data.get('response')}")
                             print("="*70)
-                        
-                        elif data.get("type") == "audio_start":
-                            print("\n🔊 Receiving TTS audio...", flush=True)
-                            self.playing_audio = True
-                            # Start audio playback in separate thread
-                            threading.Thread(target=self._play_audio, daemon=True).start()
-                        
-                        elif data.get("type") == "audio_end":
-                            print("✅ TTS audio complete\n")
-                            # Signal end of audio
-                            self.audio_playback_queue.put(None)
-                            self.playing_audio = False
-                        
-                        elif data.get("type") == "interrupted":
-                            print("⚠️  TTS interrupted - New speech detected\n")
-                            # Signal audio playback thread to stop immediately
-                            self.stop_playback.set()
-                            # Clear playback queue
-                            while not self.audio_playback_queue.empty():
-                                try:
-                                    self.audio_playback_queue.get_nowait()
-                                except:
-                                    break
-                            self.playing_audio = False
                     
                     except json.JSONDecodeError:
                         print(f"Received non-JSON text: {message}")
@@ -0,0 +1,27 @@
+"""Tests for the transcript repeat filter."""
+
+from services.stt import RecentTranscripts
+
+
+def test_recent_transcripts_drops_near_duplicates():
+    """Test repeats differing only in case or trailing punctuation are dropped."""
+    recent = RecentTranscripts(maxlen=2)
+
+    assert recent.add("Where is my battery?")
+    assert not recent.add("where is my battery")
+    assert recent.add("Swap it")
+    assert recent.add("Thanks")
+    # Oldest entry was evicted, so it is accepted again
+    assert recent.add("Where is my battery")
+
+    recent.clear()
+    assert recent.add("Thanks")
+
+
+def test_recent_transcripts_keeps_real_repeats_with_timing():
+    """Test a phrase said twice is kept, while a final re-sent for the same audio is dropped."""
+    recent = RecentTranscripts()
+
+    assert recent.add("Yes.", (1000, 1300))
+    assert recent.add("Yes.", (2100, 2400))
+    assert not recent.add("yes", (2100, 2400))
@@ -0,0 +1,71 @@
+"""Tests for TTS text helpers."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.tts import TTSTurn
+from services.tts.utils import iter_sentences, split_complete_sentences
+
+
+async def token_stream(chunks):
+    """Yield text chunks like a streaming LLM response."""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_sentences_regroups_tokens():
+    """Test streamed tokens come out as whole sentences, remainder last."""
+    chunks = ["Your battery ", "is charged. Swap", " at the next station! ", "नमस्ते। Thanks"]
+
+    sentences = [s async for s in iter_sentences(token_stream(chunks))]
+
+    assert sentences == [
+        "Your battery is charged.",
+        "Swap at the next station!",
+        "नमस्ते।",
+        "Thanks",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_sentences_skips_blank_output():
+    """Test whitespace-only streams yield nothing."""
+    sentences = [s async for s in iter_sentences(token_stream(["  ", "\n"]))]
+
+    assert sentences == []
+
+
+def test_split_complete_sentences_keeps_unfinished_text():
+    """Test complete sentences are split off and the rest stays buffered."""
+    complete, rest = split_complete_sentences("Your battery is charged. Swap at")
+
+    assert complete == "Your battery is charged. "
+    assert rest == "Swap at"
+
+
+def test_split_complete_sentences_waits_for_min_length():
+    """Test short sentences and decimals do not count as boundaries."""
+    assert split_complete_sentences("Okay. Then") == ("", "Okay. Then")
+    assert split_complete_sentences("It costs 3.5 rupees") == ("", "It costs 3.5 rupees")
+
+
+@pytest.mark.asyncio
+async def test_tts_turn_closes_context_in_first_chunk_language():
+    """Test "auto" is pinned on the first chunk, so the empty closing chunk keeps the Hindi voice."""
+    calls = []
+
+    async def fake_send_tts_chunk(**kwargs):
+        calls.append(kwargs)
+
+    service = MagicMock()
+    service.send_tts_chunk = fake_send_tts_chunk
+    turn = TTSTurn(service, "auto")
+
+    await turn.send("आपकी बैटरी चार्ज है।", True)
+    await turn.send("", False)
+
+    assert [call["language"] for call in calls] == ["hi", "hi"]
+    assert calls[0]["context_id"] == calls[1]["context_id"]
+    assert calls[1]["continue_flag"] is False
@@ -0,0 +1,71 @@
+"""Tests for Twilio audio helpers."""
+
+import audioop
+import base64
+
+import numpy as np
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers.twilio import PCM16_TO_ULAW, float32_to_pcm16, media_message, media_payload, router
+
+
+def test_pcm16_to_ulaw_table_matches_audioop():
+    """Test the lookup table encodes every PCM16 sample like audioop.lin2ulaw."""
+    pcm = np.arange(-32768, 32768, dtype=np.int16).tobytes()
+
+    encoded = PCM16_TO_ULAW[np.frombuffer(pcm, dtype=np.uint16)].tobytes()
+
+    assert encoded == audioop.lin2ulaw(pcm, 2)
+
+
+def test_float32_to_pcm16_saturates_out_of_range_samples():
+    """Test TTS overshoot clips to the PCM16 range instead of wrapping around."""
+    samples = np.array([0.0, 0.5, -0.5, 1.5, -1.5], dtype=np.float32)
+
+    result = float32_to_pcm16(samples)
+
+    assert result.dtype == np.int16
+    assert list(result) == [0, 16383, -16383, 32767, -32767]
+
+
+def test_media_message_matches_twilio_media_event():
+    """Test the spliced media message decodes to the event Twilio expects."""
+    audio = np.arange(256, dtype=np.uint8)
+
+    message = orjson.loads(media_message("MZ123", audio))
+
+    assert message == {
+        "event": "media",
+        "streamSid": "MZ123",
+        "media": {"payload": base64.b64encode(audio.tobytes()).decode()},
+    }
+
+
+def test_voice_webhook_escapes_call_parameters():
+    """Test the TwiML echoes the call parameters as escaped attributes."""
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).get("/twilio/voice", params={"CallSid": "CA1", "From": '+1<"5>'})
+
+    assert response.headers["content-type"].startswith("application/xml")
+    assert '<Parameter name="callSid" value="CA1"/>' in response.text
+    assert '<Parameter name="from" value=\'+1&lt;"5&gt;\'/>' in response.text
+    assert response.text.endswith("</Stream>\n    </Connect>\n</Response>")
+
+
+def test_media_payload_fast_path_and_fallbacks():
+    """Test media payloads are sliced out and other messages are left to the JSON parser."""
+    media = orjson.dumps({
+        "event": "media",
+        "sequenceNumber": "3",
+        "media": {"track": "inbound", "chunk": "1", "timestamp": "5", "payload": "f/8AAQ=="},
+        "streamSid": "MZ123",
+    }).decode()
+
+    assert media_payload(media) == "f/8AAQ=="
+    assert media_payload(media.replace("f/8AAQ==", "f\\/8AAQ==")) is None
+    assert media_payload('{"event":"mark","mark":{"name":"end_of_response"}}') is None
+    assert media_payload('{"streamSid":"MZ123","event":"media","media":{"payload":"AA=="}}') is None
@@ -0,0 +1,128 @@
+"""Tests for VAD helpers."""
+
+import numpy as np
+import pytest
+import torch
+
+from services.stt import PCMRingBuffer
+
+
+def pcm(values) -> bytes:
+    """Encode sample values as PCM16 bytes."""
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+def test_ring_buffer_yields_frames_across_wrap():
+    """Test frames come out in order even when writes wrap the buffer."""
+    ring = PCMRingBuffer(frame_samples=4, capacity_frames=2)
+
+    ring.write(pcm(range(6)))
+    assert list(ring.read_frame()) == [0, 1, 2, 3]
+    assert ring.read_frame() is None
+
+    ring.write(pcm(range(6, 12)))
+    assert list(ring.read_frame()) == [4, 5, 6, 7]
+    assert list(ring.read_frame()) == [8, 9, 10, 11]
+    assert ring.available == 0
+
+
+def test_ring_buffer_drops_oldest_frames_on_overflow():
+    """Test overflow discards whole frames from the oldest end."""
+    ring = PCMRingBuffer(frame_samples=4, capacity_frames=2)
+
+    ring.write(pcm(range(8)))
+    ring.write(pcm(range(8, 10)))
+
+    assert list(ring.read_frame()) == [4, 5, 6, 7]
+    assert ring.read_frame() is None
+    assert ring.available == 2
+
+
+def test_ring_buffer_frames_are_views_of_fixed_storage():
+    """Test writes copy into preallocated storage and frames are read without copying."""
+    ring = PCMRingBuffer(frame_samples=4, capacity_frames=2)
+    storage = ring._buf
+
+    ring.write(bytearray(pcm(range(4))))
+    ring.write(memoryview(pcm(range(4, 8))))
+    first = ring.read_frame()
+    second = ring.read_frame()
+
+    assert ring._buf is storage
+    assert np.shares_memory(first, storage)
+    assert np.shares_memory(second, storage)
+    assert list(second) == [4, 5, 6, 7]
+
+
+def test_window_confidence_scores_each_model_frame(monkeypatch):
+    """Test a multi-frame window reports the peak confidence of its frames."""
+    from services.stt import VADService
+
+    vad = VADService()
+    scores = iter([0.2, 0.9])
+
+    class FakeModel:
+        calls = []
+
+        def __call__(self, frame, sample_rate):
+            self.calls.append(len(frame))
+            return torch.tensor(next(scores))
+
+    vad.model = FakeModel()
+
+    assert vad.get_window_confidence(np.zeros(1024, dtype=np.int16)) == pytest.approx(0.9)
+    assert vad.model.calls == [512, 512]
+
+
+def test_int2float_scales_pcm16():
+    """Test PCM16 samples map to float32 in [-1, 1)."""
+    from services.stt import VADService
+
+    samples = np.array([0, 16384, -32768], dtype=np.int16)
+
+    result = VADService.int2float(None, samples)
+
+    assert result.dtype == np.float32
+    assert result.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_is_quiet_gates_on_rms_energy():
+    """Test low-energy windows are gated and louder ones are scored."""
+    from services.stt import VADService
+
+    vad = VADService(energy_gate=200.0)
+
+    assert vad.is_quiet(np.full(1024, 50, dtype=np.int16))
+    assert vad.is_quiet(np.zeros(0, dtype=np.int16))
+    assert not vad.is_quiet(np.full(1024, -1000, dtype=np.int16))
+
+
+def test_get_confidence_reads_memoryview_slices():
+    """Test a memoryview slice is scored without first copying it to bytes."""
+    from services.stt import VADService
+
+    vad = VADService()
+    seen = []
+
+    def fake_model(frame, sample_rate):
+        seen.append(frame.tolist()[:2])
+        return torch.tensor(0.5)
+
+    vad.model = fake_model
+    audio = memoryview(pcm([16384, -16384] * 512 + [0, 0]))
+
+    assert vad.get_confidence(audio[:1024]) == pytest.approx(0.5)
+    assert seen == [[0.5, -0.5]]
+
+
+def test_vad_services_get_separate_model_copies():
+    """Test each VADService copies the shared warm model instead of sharing state."""
+    from services.stt import VADService
+    from services.stt.vad_service import get_base_model
+
+    first = VADService()
+    second = VADService()
+
+    assert get_base_model() is get_base_model()
+    assert first.model is not second.model
+    assert first.model is not get_base_model()
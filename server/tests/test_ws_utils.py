@@ -0,0 +1,126 @@
+"""Tests for shared WebSocket helpers."""
+
+import asyncio
+from datetime import date, datetime
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from routers.ws_utils import WebSocketWriter, cancel_and_wait, encode_fragment, send_json_fast
+
+
+class Stamp:
+    """Date-like value that only exposes isoformat()."""
+
+    def isoformat(self) -> str:
+        return "2026-01-01"
+
+
+@pytest.mark.asyncio
+async def test_send_json_fast_encodes_nested_dates():
+    """Test nested datetimes and date-like values encode as ISO strings."""
+    ws = AsyncMock()
+    created = datetime(2026, 1, 1, 12, 30)
+
+    await send_json_fast(ws, {"tool_results": [{"created_at": created, "due": date(2026, 1, 2), "stamp": Stamp()}]})
+
+    payload = orjson.loads(ws.send_text.await_args.args[0])
+    assert payload == {"tool_results": [{"created_at": created.isoformat(), "due": "2026-01-02", "stamp": "2026-01-01"}]}
+
+
+@pytest.mark.asyncio
+async def test_websocket_writer_sends_frames_in_order():
+    """Test queued text and binary frames go out in the order they were queued."""
+    ws = AsyncMock()
+    sent = []
+    ws.send_text.side_effect = lambda text: sent.append(text)
+    ws.send_bytes.side_effect = lambda data: sent.append(data)
+    writer = WebSocketWriter(ws)
+    writer.start()
+
+    writer.send_bytes(b"\x01")
+    writer.send_json({"type": "response_stream", "text": "hi"})
+    writer.send_bytes(b"\x03")
+    await asyncio.sleep(0)
+    await writer.close()
+
+    assert sent == [b"\x01", '{"type":"response_stream","text":"hi"}', b"\x03"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_writer_stops_after_send_failure():
+    """Test a failed send closes the writer and later frames are dropped."""
+    ws = AsyncMock()
+    ws.send_bytes.side_effect = RuntimeError("connection closed")
+    writer = WebSocketWriter(ws)
+    writer.start()
+
+    writer.send_bytes(b"\x02audio")
+    await asyncio.sleep(0)
+    writer.send_text("late")
+    await writer.close()
+
+    assert writer.closed
+    ws.send_text.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cancel_and_wait_keeps_caller_cancellable():
+    """Test the target task is cancelled and the caller's own cancellation still propagates."""
+    target = asyncio.create_task(asyncio.sleep(10))
+
+    await cancel_and_wait(target)
+    assert target.cancelled()
+
+    async def interrupter():
+        await cancel_and_wait(asyncio.create_task(asyncio.sleep(10)))
+        await asyncio.sleep(10)
+
+    caller = asyncio.create_task(interrupter())
+    await asyncio.sleep(0)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+
+@pytest.mark.asyncio
+async def test_websocket_writer_close_keeps_caller_cancellable():
+    """Test cancelling a coroutine waiting in close() still cancels it."""
+    sending = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_send(data):
+        sending.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # Writer cleanup outlasts the caller's own cancellation
+            await release.wait()
+            raise
+
+    ws = AsyncMock()
+    ws.send_bytes.side_effect = slow_send
+    writer = WebSocketWriter(ws)
+    writer.start()
+    writer.send_bytes(b"\x01")
+    await sending.wait()
+
+    closer = asyncio.create_task(writer.close())
+    await asyncio.sleep(0)
+    closer.cancel()
+    await asyncio.wait([closer], timeout=1)
+
+    # close() must not wait out the writer's cleanup or swallow the cancellation
+    assert closer.cancelled()
+    release.set()
+    await asyncio.sleep(0)
+
+
+def test_encode_fragment_embeds_preencoded_json():
+    """Test a fragment is embedded as-is, so shared fields are encoded only once."""
+    fragment = encode_fragment([{"at": datetime(2026, 1, 1)}])
+
+    payload = orjson.loads(orjson.dumps({"type": "llm_start", "tool_results": fragment}))
+
+    assert payload == {"type": "llm_start", "tool_results": [{"at": "2026-01-01T00:00:00"}]}